@@ -16,7 +16,7 @@ Why Claude Code CLI (Not SDK)?
 6. Proven reliability - Battle-tested by thousands of production users
 
 What This Script Does:
-- Fetches GitHub issue details via gh CLI
+- Fetches GitHub issue details via the GitHub API (PyGithub)
 - Loads project context from .quetrex/ and CLAUDE.md
 - Builds comprehensive prompt with issue description + context
 - Executes: claude --prompt prompt.txt
@@ -49,6 +49,7 @@ Environment Variables:
     CLAUDE_REQUIRE_TESTS        Whether to require tests (default: false)
     CLAUDE_GITHUB_COMMENTS      Post progress comments (default: true)
     CLAUDE_LOG_API_CALLS        Log all API calls (default: true)
+    CLAUDE_PARALLEL_LINT        Run npm/yarn/pnpm lint alongside the build (default: true)
     CLAUDE_RATE_LIMIT_TPM       Max INPUT tokens per minute (default: 20000)
     CLAUDE_RATE_LIMIT_RETRIES   Max retry attempts on rate limit (default: 3)
     CLAUDE_RATE_LIMIT_THRESHOLD Throttle at N% of limit (default: 0.8)
@@ -58,6 +59,7 @@ Dependencies:
     anthropic>=0.70.0           (current implementation uses SDK directly)
     PyGithub>=2.0.0
     requests>=2.14.0
+    orjson                      (optional, faster JSON logging and result output)
 
     Claude Code CLI (installed, for future use):
     curl -fsSL https://claude.ai/install.sh | bash
@@ -66,20 +68,54 @@ Dependencies:
 import os
 import sys
 import json
+import math
 import subprocess
 import time
 import signal
 import re
 import shlex
+import shutil
+import string
 import glob
+import atexit
+import queue
+import random
+import sqlite3
+import threading
 # Socket module removed - credential proxy disabled
 from datetime import datetime
+from bisect import bisect_right
+from collections import deque
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Callable, Deque
 from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, Future
 
-# GitHub API integration
-from github import Github, GithubException
+# GitHub API integration - PyGithub is imported on first use by
+# _import_github() so the usage and argument-error paths skip its import cost
+Github: Any = None
+Auth: Any = None
+
+
+class GithubException(Exception):
+    """Placeholder until PyGithub is imported (never raised)"""
+
+
+def _import_github() -> None:
+    """Import PyGithub and bind Github, Auth and GithubException at module level"""
+    global Github, Auth, GithubException
+    if Github is None:
+        from github import Auth, Github, GithubException
+
+# Fast JSON serialization (optional - falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# GitHub remote URL: https://github.com/owner/repo.git or git@github.com:owner/repo.git
+_GH_URL_RE = re.compile(r'github\.com[:/]([^/]+)/([^/\.]+)')
 
 # No longer using Anthropic SDK directly - using Claude Code CLI instead
 # SDK imports removed as they're not needed for CLI-based approach
@@ -100,6 +136,7 @@ class Config:
     require_tests: bool
     github_comments: bool
     log_api_calls: bool
+    parallel_lint: bool  # Run lint alongside the build (disable if lint needs build output)
 
     @classmethod
     def from_env(cls) -> 'Config':
@@ -122,6 +159,7 @@ class Config:
             require_tests=os.getenv("CLAUDE_REQUIRE_TESTS", "false").lower() == "true",
             github_comments=os.getenv("CLAUDE_GITHUB_COMMENTS", "true").lower() == "true",
             log_api_calls=os.getenv("CLAUDE_LOG_API_CALLS", "true").lower() == "true",
+            parallel_lint=os.getenv("CLAUDE_PARALLEL_LINT", "true").lower() == "true",
         )
 
 
@@ -148,6 +186,12 @@ class Config:
 class RateLimiter:
     """Track INPUT token usage per minute to stay within API limits"""
 
+    # No per-instance __dict__ - the attributes below are all it ever has
+    __slots__ = (
+        'tokens_per_minute', 'throttle_threshold', 'min_request_interval',
+        'tokens_used', 'last_request_time', '_lock', '_running_total', '_throttle_tokens',
+    )
+
     def __init__(self, tokens_per_minute: int = 20000, throttle_threshold: float = 0.8, min_request_interval: float = 2.5):
         """
         Initialize rate limiter
@@ -160,8 +204,16 @@ class RateLimiter:
         self.tokens_per_minute = tokens_per_minute
         self.throttle_threshold = throttle_threshold
         self.min_request_interval = min_request_interval
-        self.tokens_used: List[Tuple[float, int]] = []  # List of (timestamp, INPUT_token_count) tuples
+        # (timestamp, INPUT_token_count) per second that saw requests, oldest
+        # first - a second's requests share one entry stamped with the latest
+        # of them, so the window holds at most ~61 entries however busy it is
+        self.tokens_used: Deque[Tuple[float, int]] = deque()
         self.last_request_time: float = 0.0  # Track last request for pacing
+        self._lock = threading.Lock()  # Guards tokens_used and last_request_time
+        self._running_total = 0  # Sum of tokens in tokens_used, kept in step by add/prune
+        # Usage is a whole number of tokens, so usage >= threshold is the same
+        # test as usage >= ceil(threshold) - an int compare
+        self._throttle_tokens = math.ceil(tokens_per_minute * throttle_threshold)
 
     def add_usage(self, input_tokens: int, output_tokens: int) -> None:
         """
@@ -170,30 +222,92 @@ class RateLimiter:
         CRITICAL: Only input_tokens count against Anthropic's rate limit.
         Output tokens are tracked separately and don't affect rate limiting.
         """
-        now = time.time()
-        # BUG FIX #1: Only count INPUT tokens (output tokens don't count against limit)
-        self.tokens_used.append((now, input_tokens))
+        with self._lock:
+            now = time.time()
+            # BUG FIX #1: Only count INPUT tokens (output tokens don't count against limit)
+            self._append(now, input_tokens)
+
+            # Clean up old entries (older than 60 seconds)
+            self._prune(now)
+
+            # Update last request time
+            self.last_request_time = now
+
+    # The helpers below take now from the caller so each public call reads the
+    # clock once (and again only after sleeping). Callers hold the lock.
+
+    def _append(self, now: float, input_tokens: int) -> None:
+        """Record input_tokens at now, folding into the newest entry if it's the same second"""
+        last = self.tokens_used[-1] if self.tokens_used else None
+        if last is not None and int(last[0]) == int(now):
+            self.tokens_used[-1] = (now, last[1] + input_tokens)
+        else:
+            self.tokens_used.append((now, input_tokens))
+        self._running_total += input_tokens
+
+    def _usage_at(self, now: float) -> int:
+        """INPUT tokens in the 60 seconds before now"""
+        self._prune(now)
+        return self._running_total
 
-        # Clean up old entries (older than 60 seconds)
+    def _prune(self, now: float) -> None:
+        """Drop entries older than 60 seconds"""
         cutoff = now - 60
-        self.tokens_used = [(ts, tokens) for ts, tokens in self.tokens_used if ts > cutoff]
+        tokens_used = self.tokens_used
+        if not tokens_used or tokens_used[0][0] > cutoff:
+            return
+
+        # Entries are appended in timestamp order, so the expired ones are a
+        # prefix - binary search for its end instead of testing each entry
+        expired = bisect_right(tokens_used, cutoff, key=itemgetter(0))
+        if expired == len(tokens_used):
+            # Idle for a minute or more: drop everything in one go
+            tokens_used.clear()
+            self._running_total = 0
+        else:
+            for _ in range(expired):
+                self._running_total -= tokens_used.popleft()[1]
 
-        # Update last request time
-        self.last_request_time = now
+    def try_consume(self, tokens: int) -> Tuple[bool, float]:
+        """
+        Atomically check the window and record usage if the request fits
+
+        Pass INPUT tokens only, same as add_usage(). A request larger than the
+        threshold is still allowed into an empty window so it can't block forever.
+
+        Returns:
+            (ok, retry_after): ok is True if the tokens were recorded, otherwise
+            retry_after is how many seconds to wait before trying again
+        """
+        with self._lock:
+            now = time.time()
+
+            # Request pacing
+            time_since_last = now - self.last_request_time
+            if self.last_request_time > 0 and time_since_last < self.min_request_interval:
+                return False, self.min_request_interval - time_since_last
+
+            # Projected usage against threshold - pruning only lowers the
+            # total, so only prune when the unpruned total says we might be over
+            threshold = self._throttle_tokens
+            if self._running_total + tokens >= threshold:
+                self._prune(now)
+                if self.tokens_used and self._running_total + tokens >= threshold:
+                    oldest_time = self.tokens_used[0][0]
+                    return False, max(0.0, 60 - (now - oldest_time))
+
+            self._append(now, tokens)
+            self.last_request_time = now
+            return True, 0.0
 
     def get_current_usage(self) -> int:
         """Get total INPUT tokens used in the last 60 seconds"""
-        now = time.time()
-        cutoff = now - 60
-        # Clean up stale entries
-        self.tokens_used = [(ts, tokens) for ts, tokens in self.tokens_used if ts > cutoff]
-        return sum(tokens for _, tokens in self.tokens_used)
+        with self._lock:
+            return self._usage_at(time.time())
 
     def should_throttle(self) -> bool:
         """Check if we're approaching the rate limit"""
-        current = self.get_current_usage()
-        threshold = self.tokens_per_minute * self.throttle_threshold
-        return current >= threshold
+        return self.get_current_usage() >= self._throttle_tokens
 
     def estimate_next_request_tokens(self, conversation_turns: int) -> int:
         """
@@ -221,17 +335,21 @@ class RateLimiter:
             wait_for_pacing = self.min_request_interval - time_since_last
             logger_func(f"Request pacing: waiting {wait_for_pacing:.1f}s (min interval: {self.min_request_interval}s)")
             time.sleep(wait_for_pacing)
-
-        # 2. Check if next request would exceed threshold (proactive)
-        current_usage = self.get_current_usage()
+            now = time.time()
+
+        # 2. Check if next request would exceed threshold (proactive). The
+        # oldest timestamp is read under the same lock as the usage - another
+        # thread may prune the window as soon as it's released.
+        with self._lock:
+            current_usage = self._usage_at(now)
+            oldest_time = self.tokens_used[0][0] if self.tokens_used else None
         estimated_next = self.estimate_next_request_tokens(conversation_turns)
         projected_usage = current_usage + estimated_next
-        threshold = self.tokens_per_minute * self.throttle_threshold
+        threshold = self._throttle_tokens
 
         if projected_usage >= threshold:
             # Wait for oldest tokens to age out of 60-second window
-            if self.tokens_used:
-                oldest_time = self.tokens_used[0][0]
+            if oldest_time is not None:
                 wait_time = 60 - (now - oldest_time) + 2  # +2s buffer
                 if wait_time > 0:
                     logger_func(
@@ -240,13 +358,12 @@ class RateLimiter:
                         f"waiting {wait_time:.1f}s for window reset"
                     )
                     time.sleep(wait_time)
-                    # Clean up old entries after wait
                     now = time.time()
-                    cutoff = now - 60
-                    self.tokens_used = [(ts, tokens) for ts, tokens in self.tokens_used if ts > cutoff]
 
-        # 3. Double-check we're under threshold after waiting
-        current_usage = self.get_current_usage()
+        # 3. Double-check we're under threshold after waiting (this also
+        # cleans up entries that aged out during the wait)
+        with self._lock:
+            current_usage = self._usage_at(now)
         if current_usage >= threshold:
             # Emergency wait - clear the entire window
             logger_func(
@@ -254,7 +371,248 @@ class RateLimiter:
                 f"waiting 65s to fully reset window"
             )
             time.sleep(65)
-            self.tokens_used = []
+            with self._lock:
+                self.tokens_used.clear()
+                self._running_total = 0
+
+
+# ============================================================================
+# Logging
+# ============================================================================
+
+LOG_QUEUE_SIZE = 10000      # Max queued log lines before new ones are dropped
+LOG_BATCH_SIZE = 64         # Max lines per write by the log writer thread
+LOG_BATCH_INTERVAL = 0.1    # Max seconds the writer waits to fill a batch
+
+
+# ============================================================================
+# Caching
+# ============================================================================
+
+# Issue details rarely change during a run; repo info and branch never do
+ISSUE_CACHE_TTL = 600  # seconds
+
+
+class MemoryCache:
+    """Minimal in-memory key/value cache with optional per-key TTL"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Any, Optional[float]]] = {}  # key -> (value, expires_at)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value; ttl=None keeps it for the lifetime of the cache"""
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a cached value"""
+        self._entries.pop(key, None)
+
+
+# ============================================================================
+# GitHub API
+# ============================================================================
+
+# Max concurrent GitHub calls - well under GitHub's secondary rate limits
+GITHUB_MAX_WORKERS = 4
+
+# Retry backoff for rate-limited (403/429) and 5xx GitHub responses
+GITHUB_BACKOFF_INITIAL = 1.0  # seconds
+GITHUB_BACKOFF_MAX = 60.0     # seconds - also caps Retry-After / reset waits
+
+# Client-side throttle for outbound GitHub calls - spends a burst allowance,
+# then paces to a steady rate instead of running into 403/429 responses
+GITHUB_REQUESTS_PER_SECOND = 1.0
+GITHUB_BURST = 10
+
+# Issues must carry this label before the agent spends anything on them
+REQUIRED_LABEL = "ai-feature"
+
+# Minimum gap between progress comments - updates inside it are coalesced
+PROGRESS_INTERVAL = 300  # seconds
+
+
+def github_retry_delay(status: int, headers: Any, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying a failed GitHub request, or None if it
+    shouldn't be retried
+
+    Honors Retry-After and X-RateLimit-Reset when GitHub sends them, otherwise
+    uses exponential backoff with full jitter.
+    """
+    headers = headers or {}
+    if status not in (403, 429) and status < 500:
+        return None
+
+    retry_after = headers.get("Retry-After") or headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(float(retry_after), GITHUB_BACKOFF_MAX)
+        except ValueError:
+            pass
+
+    remaining = headers.get("X-RateLimit-Remaining") or headers.get("x-ratelimit-remaining")
+    reset = headers.get("X-RateLimit-Reset") or headers.get("x-ratelimit-reset")
+    if remaining == "0" and reset:
+        try:
+            return min(max(float(reset) - time.time(), 0.0) + 1, GITHUB_BACKOFF_MAX)
+        except ValueError:
+            pass
+
+    if status == 403:
+        # Plain permission errors aren't worth retrying
+        return None
+
+    return random.uniform(0, min(GITHUB_BACKOFF_MAX, GITHUB_BACKOFF_INITIAL * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket - acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping if the bucket is empty
+
+        The token is reserved under the lock (the balance may go negative), so
+        concurrent callers queue up behind each other instead of all waking at
+        once.
+
+        Returns:
+            Seconds slept
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# ETags persist across runs - a 304 response doesn't count against the rate limit
+ETAG_CACHE_PATH = Path.home() / ".cache" / "sentra" / "gh.db"
+
+
+class ETagCache:
+    """Persistent {url: (etag, body)} store for conditional GitHub GETs"""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS etags (url TEXT PRIMARY KEY, etag TEXT NOT NULL, body TEXT NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Tuple[str, str]]:
+        """Return (etag, body) for a URL, or None if not cached"""
+        with self._lock:
+            return self._db.execute("SELECT etag, body FROM etags WHERE url = ?", (url,)).fetchone()
+
+    def set(self, url: str, etag: str, body: str) -> None:
+        """Store the latest etag and body for a URL"""
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO etags VALUES (?, ?, ?)", (url, etag, body))
+            self._db.commit()
+
+
+# ============================================================================
+# Quality Checks
+# ============================================================================
+
+# Candidate commands, tried in order - the first whose program is on PATH runs.
+# Run directly (no shell) since none of them need shell features, except on
+# Windows where the .cmd shims need one.
+BUILD_COMMANDS = (
+    ("npm", "run", "build"),
+    ("yarn", "build"),
+    ("pnpm", "build"),
+    ("cargo", "build"),
+    ("make", "build"),
+)
+TEST_COMMANDS = (
+    ("npm", "test"),
+    ("yarn", "test"),
+    ("pnpm", "test"),
+    ("cargo", "test"),
+    ("make", "test"),
+)
+LINT_COMMANDS = (
+    ("npm", "run", "lint"),
+    ("yarn", "lint"),
+    ("pnpm", "lint"),
+    ("cargo", "clippy"),
+    ("make", "lint"),
+)
+
+# Lint tools that may run alongside the build. cargo serializes on its build
+# lock and make targets can share outputs, so those lint after the build.
+PARALLEL_LINT_TOOLS = frozenset({"npm", "yarn", "pnpm"})
+
+# Linting only runs if a file with one of these extensions changed
+LINT_EXTENSIONS = frozenset({".py", ".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs", ".go", ".rs"})
+
+# Tests are skipped when every changed file is one of these (docs and images)
+NON_CODE_EXTENSIONS = frozenset({
+    ".md", ".mdx", ".txt", ".rst",
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp"
+})
+
+
+# ============================================================================
+# Git
+# ============================================================================
+
+# Prebuilt argv for the git calls made on every run
+GIT_STATUS_ARGV = ("git", "status", "--porcelain=v1", "-z", "--untracked-files=all")
+GIT_REMOTE_URL_ARGV = ("git", "config", "--get", "remote.origin.url")
+GIT_CURRENT_BRANCH_ARGV = ("git", "branch", "--show-current")
+
+COMMIT_TEMPLATE = string.Template("""Fix: $title
+
+Implements #$issue_number
+
+This commit implements the feature/fix described in issue #$issue_number.
+
+Changes:
+$files
+$more
+
+This commit was created by Glen Barnhardt with the help of Claude Code
+
+Generated by Quetrex AI Agent
+Co-Authored-By: Claude <noreply@anthropic.com>
+""")
+
+
+# ============================================================================
+# Project Context
+# ============================================================================
+
+# Context files bigger than this would swamp the prompt, so they're skipped
+CONTEXT_FILE_MAX_BYTES = 256 * 1024
 
 
 # ============================================================================
@@ -283,6 +641,12 @@ MODELS = {
     },
 }
 
+# Per-token (input, output) cost in dollars, precomputed from MODELS
+TOKEN_COSTS = {
+    name: (info['input_cost'] / 1_000_000, info['output_cost'] / 1_000_000)
+    for name, info in MODELS.items()
+}
+
 def select_model_for_issue(issue: Dict[str, Any]) -> str:
     """
     Select the appropriate model based on issue complexity.
@@ -389,6 +753,8 @@ class AgentWorker:
     """
 
     def __init__(self, issue_number: int, repo_path: str = "."):
+        _import_github()
+
         self.issue_number = issue_number
         self.repo_path = Path(repo_path).resolve()
         self.config = Config.from_env()
@@ -412,24 +778,71 @@ class AgentWorker:
             self.rate_limiter = RateLimiter(tokens_per_minute=1000, throttle_threshold=0.8)
 
         # Tracking
-        self.start_time = time.time()
+        self.start_ns = time.monotonic_ns()  # Monotonic - immune to wall-clock jumps
         self.rate_limit_initialized = True  # Track that rate limiter is set up
         self.api_calls = 0
         self.estimated_cost = 0.0
         self.files_changed: set = set()
         self.progress_updates = []
-        self.last_progress_time = time.time()
+        self.last_progress_ns = time.monotonic_ns()
+        self._pending_progress: Optional[str] = None  # latest status held back by the interval
+        self._progress_timer: Optional[threading.Timer] = None
+        self._progress_lock = threading.Lock()
+        self._cmd_cache: Dict[str, bool] = {}  # command name -> found in PATH
+        self._status_cache: Optional[Tuple[float, List[Tuple[str, str]]]] = None  # (monotonic time, entries)
 
         # GitHub API base URL
         self.github_api = "https://api.github.com"
 
-        self.log("Phase 1 security: Docker container isolation active")
+        # PyGithub client and repository, created lazily and reused for the run
+        self._gh: Optional["Github"] = None
+        self._repo = None
+        self._gh_lock = threading.Lock()
+
+        # Independent GitHub calls (issue fetch, comments, labels) run here
+        # so they overlap with local work instead of blocking the run
+        self._gh_pool = ThreadPoolExecutor(max_workers=GITHUB_MAX_WORKERS, thread_name_prefix="github")
+        self._background: List[Future] = []
+        self._gh_bucket = TokenBucket(GITHUB_REQUESTS_PER_SECOND, GITHUB_BURST)
+
+        # Conditional-request cache for GitHub GETs (optional - works without it)
+        self._etags: Optional[ETagCache] = None
+        try:
+            self._etags = ETagCache(ETAG_CACHE_PATH)
+        except (OSError, sqlite3.Error) as e:
+            print(f"WARNING: ETag cache unavailable: {e}", file=sys.stderr)
+
+        # Cache for issue details, repo info and current branch
+        self._cache = MemoryCache()
 
         # Setup telemetry
         self.telemetry_dir = Path.home() / ".claude" / "telemetry"
         self.telemetry_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = self.telemetry_dir / "agents.log"
 
+        # Log lines are queued and written by a background thread in batches,
+        # so the main thread never blocks on disk or a full stdout pipe.
+        # The log file stays open (64KB buffer) for the whole run.
+        self._log_fh = None
+        try:
+            self._log_fh = open(self.log_file, "a", buffering=65536)
+            atexit.register(self._log_fh.close)
+        except OSError as e:
+            print(f"WARNING: Failed to open log file: {e}", file=sys.stderr)
+
+        self._log_queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._log_dropped = 0
+        self._last_ts_sec = -1  # log() only reformats the timestamp once per second
+        self._last_ts_str = ""
+        self._log_prefix = f"[{self.repo_path.name}] [issue-{self.issue_number}]"
+        self._log_thread: Optional[threading.Thread] = threading.Thread(
+            target=self._log_drain, name="agent-log-writer", daemon=True
+        )
+        self._log_thread.start()
+        atexit.register(self.close_log)
+
+        self.log("Phase 1 security: Docker container isolation active")
+
         # Validate environment
         self._validate_environment()
 
@@ -439,30 +852,87 @@ class AgentWorker:
 
     def log(self, message: str, level: str = "INFO") -> None:
         """Log message to telemetry file and stdout"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        project = self.repo_path.name
-        log_entry = f"[{timestamp}] [{project}] [issue-{self.issue_number}] [{level}] {message}"
+        now_s = int(time.time())
+        if now_s != self._last_ts_sec:
+            self._last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now_s))
+            self._last_ts_sec = now_s
+        self._emit_log(f"[{self._last_ts_str}] {self._log_prefix} [{level}] {message}\n")
+
+    def _emit_log(self, line: str) -> None:
+        """Queue a log line for the writer thread (written inline once the log is closed)"""
+        if self._log_thread is None:
+            self._write_log_batch(line)
+            return
 
-        # Write to log file
         try:
-            with open(self.log_file, "a") as f:
-                f.write(log_entry + "\n")
-        except Exception as e:
-            print(f"WARNING: Failed to write to log file: {e}", file=sys.stderr)
+            self._log_queue.put_nowait(line)
+        except queue.Full:
+            # Bounded queue - drop rather than wedge the worker on slow I/O
+            self._log_dropped += 1
+            if self._log_dropped == 1:
+                print("WARNING: Log queue full, dropping log entries", file=sys.stderr)
+
+    def _log_drain(self) -> None:
+        """Writer thread: collect up to LOG_BATCH_SIZE lines (or 100ms) per write"""
+        while True:
+            batch = [self._log_queue.get()]
+            deadline = time.monotonic() + LOG_BATCH_INTERVAL
+            while batch[-1] is not None and len(batch) < LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            if batch:
+                self._write_log_batch("".join(batch))
+            if stop:
+                return
+
+    def _write_log_batch(self, data: str) -> None:
+        """Write log data to the telemetry file and stdout"""
+        if self._log_fh is not None:
+            try:
+                self._log_fh.write(data)
+                self._log_fh.flush()
+            except Exception as e:
+                print(f"WARNING: Failed to write to log file: {e}", file=sys.stderr)
+
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+    def close_log(self) -> None:
+        """Write out all queued log lines and stop the writer thread"""
+        if self._log_thread is None:
+            return
+
+        self._log_queue.put(None)
+        self._log_thread.join()
+        self._log_thread = None
 
-        # Print to stdout
-        print(log_entry, flush=True)
+        if self._log_dropped:
+            print(f"WARNING: Dropped {self._log_dropped} log entries (log queue full)", file=sys.stderr)
 
     def log_structured(self, event: str, data: Dict[str, Any]) -> None:
-        """Log structured data as JSON"""
+        """Log structured data as one JSON line (written directly, not via log())"""
         log_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "project": self.repo_path.name,
             "issue": self.issue_number,
             "event": event,
             **data
         }
-        self.log(f"STRUCTURED: {json.dumps(log_data)}", "DATA")
+        if orjson is not None:
+            line = orjson.dumps(log_data, option=orjson.OPT_APPEND_NEWLINE).decode()
+        else:
+            line = json.dumps(log_data, default=datetime.isoformat) + "\n"
+
+        self._emit_log(line)
 
     # ========================================================================
     # Credential Access
@@ -516,37 +986,45 @@ class AgentWorker:
             raise RuntimeError(f"Not a git repository: {self.repo_path}")
 
         # Test GitHub CLI authentication
-        try:
-            result = subprocess.run(
-                ["gh", "auth", "status"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode != 0:
-                raise RuntimeError(f"GitHub CLI not authenticated: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("GitHub CLI authentication check timed out")
+        # gh authenticates from GH_TOKEN/GITHUB_TOKEN when set, so only spawn
+        # `gh auth status` when relying on a stored login
+        if not os.environ.get("GH_TOKEN") and not os.environ.get("GITHUB_TOKEN"):
+            try:
+                result = subprocess.run(
+                    ["gh", "auth", "status"],
+                    cwd=self.repo_path,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    timeout=10
+                )
+                if result.returncode != 0:
+                    raise RuntimeError(f"GitHub CLI not authenticated: {result.stderr}")
+            except subprocess.TimeoutExpired:
+                raise RuntimeError("GitHub CLI authentication check timed out")
 
         self.log("Environment validation passed")
 
     def _check_command_exists(self, command: str) -> bool:
-        """Check if a command exists in PATH"""
-        result = subprocess.run(
-            ["which", command],
-            capture_output=True,
-            text=True
-        )
-        return result.returncode == 0
+        """Check if a command exists in PATH (cached, no subprocess)"""
+        if command in self._cmd_cache:
+            return self._cmd_cache[command]
+
+        exists = shutil.which(command) is not None
+        self._cmd_cache[command] = exists
+        return exists
 
     # ========================================================================
     # Constraint Checking
     # ========================================================================
 
+    def elapsed_seconds(self) -> float:
+        """Seconds since the worker started"""
+        return (time.monotonic_ns() - self.start_ns) / 1e9
+
     def check_constraints(self) -> None:
         """Check if agent has exceeded any constraints"""
-        elapsed = time.time() - self.start_time
+        elapsed = self.elapsed_seconds()
 
         if elapsed > self.config.max_execution_time:
             raise RuntimeError(
@@ -569,10 +1047,14 @@ class AgentWorker:
     # ========================================================================
 
     def get_repo_info(self) -> Dict[str, str]:
-        """Get repository owner and name from git remote"""
+        """Get repository owner and name from git remote (cached for the run)"""
+        cached = self._cache.get("repo_info")
+        if cached is not None:
+            return cached
+
         try:
             result = subprocess.run(
-                ["git", "config", "--get", "remote.origin.url"],
+                GIT_REMOTE_URL_ARGV,
                 cwd=self.repo_path,
                 capture_output=True,
                 text=True,
@@ -583,79 +1065,250 @@ class AgentWorker:
             # Parse GitHub URL
             # Format: https://github.com/owner/repo.git or git@github.com:owner/repo.git
             if "github.com" in url:
-                match = re.search(r'github\.com[:/]([^/]+)/([^/\.]+)', url)
+                match = _GH_URL_RE.search(url)
                 if match:
-                    return {"owner": match.group(1), "repo": match.group(2)}
+                    repo_info = {"owner": match.group(1), "repo": match.group(2)}
+                    self._cache.set("repo_info", repo_info)
+                    return repo_info
 
             raise ValueError(f"Could not parse GitHub URL: {url}")
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Failed to get git remote: {e.stderr}")
 
+    @property
+    def gh(self) -> "Github":
+        """
+        Shared PyGithub client (one keep-alive HTTPS session for the run)
+
+        Every GitHub call goes through it: the issue GET, comments and labels
+        (via its requester, often from _gh_pool threads) and the PR.
+        """
+        with self._gh_lock:
+            if self._gh is None:
+                # Size the connection pool to _gh_pool so the issue fetch and
+                # background comments running on it each reuse a kept-alive
+                # connection instead of opening new ones.
+                # retry=None: _with_github_retry is the only retry policy, so
+                # every attempt goes through the throttle
+                self._gh = Github(
+                    auth=Auth.Token(self.config.github_token),
+                    base_url=self.github_api,
+                    per_page=100,
+                    retry=None,
+                    pool_size=GITHUB_MAX_WORKERS
+                )
+        return self._gh
+
+    def _get_repo(self):
+        """Get the PyGithub repository (client and repo are cached for the run)"""
+        if self._repo is None:
+            repo_info = self.get_repo_info()
+            # lazy=True skips the GET /repos round trip - we only need the repo
+            # as a handle for issue and PR calls
+            self._repo = self.gh.get_repo(f"{repo_info['owner']}/{repo_info['repo']}", lazy=True)
+        return self._repo
+
+    def _with_github_retry(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a GitHub API function, retrying rate limits and server errors
+
+        Every attempt first takes a token from the client-side throttle.
+        Retries up to CLAUDE_RATE_LIMIT_RETRIES times using github_retry_delay();
+        any other error is raised immediately.
+        """
+        for attempt in range(self.rate_limit_retries + 1):
+            self._gh_bucket.acquire()
+            try:
+                return func(*args, **kwargs)
+            except GithubException as e:
+                status, headers = e.status, e.headers
+                delay = github_retry_delay(status, headers, attempt)
+                if delay is None or attempt == self.rate_limit_retries:
+                    raise
+                self.log(
+                    f"GitHub API returned {status}, retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{self.rate_limit_retries})",
+                    "WARNING"
+                )
+                time.sleep(delay)
+
+    def _github_get_json(self, path: str) -> Any:
+        """
+        GET a GitHub REST API path, revalidating any cached copy with its ETag
+
+        Goes through the shared PyGithub client's requester, so it reuses the
+        client's kept-alive connection instead of opening a new one.
+
+        Raises:
+            GithubException: On any error response
+        """
+        url = f"{self.github_api}{path}"
+        headers: Dict[str, str] = {}
+
+        cached = self._etags.get(url) if self._etags is not None else None
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
+        requester = self.gh.requester
+
+        def fetch() -> Tuple[int, Dict[str, Any], str]:
+            # requestJson doesn't raise on status, so a 304 comes back as-is
+            status, response_headers, body = requester.requestJson("GET", path, headers=headers)
+            if status >= 400:
+                raise requester.createException(status, response_headers, json.loads(body) if body else None)
+            return status, response_headers, body
+
+        status, response_headers, body = self._with_github_retry(fetch)
+        if status == 304 and cached is not None:
+            self.log(f"Not modified since last run: {path}")
+            return json.loads(cached[1])
+
+        etag = response_headers.get("etag")  # PyGithub lower-cases header names
+        if etag and self._etags is not None:
+            self._etags.set(url, etag, body)
+        return json.loads(body)
+
+    def _github_post_json(self, path: str, payload: Dict[str, Any]) -> Any:
+        """
+        POST a JSON payload to a GitHub REST API path (on the shared PyGithub session)
+
+        Raises:
+            GithubException: On any error response
+        """
+        _, data = self._with_github_retry(self.gh.requester.requestJsonAndCheck, "POST", path, input=payload)
+        return data
+
+    def _issue_path(self) -> str:
+        """REST API path of this worker's issue"""
+        repo_info = self.get_repo_info()
+        return f"/repos/{repo_info['owner']}/{repo_info['repo']}/issues/{self.issue_number}"
+
     def get_issue_details(self) -> Dict[str, Any]:
-        """Fetch issue details from GitHub using gh CLI"""
+        """Fetch issue details from GitHub using the REST API (cached for 10 minutes, ETag across runs)"""
+        cache_key = f"issue:{self.issue_number}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self.log(f"Using cached details for issue #{self.issue_number}")
+            return cached
+
         self.log(f"Fetching issue #{self.issue_number} details...")
 
         try:
-            result = subprocess.run(
-                [
-                    "gh", "issue", "view", str(self.issue_number),
-                    "--json", "title,body,labels,state,assignees,url"
-                ],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=30
-            )
-
-            issue = json.loads(result.stdout)
-            self.log(f"Issue: {issue['title']}")
-            self.log(f"State: {issue['state']}")
+            data = self._github_get_json(self._issue_path())
+        except GithubException as e:
+            raise RuntimeError(f"Failed to fetch issue: {e.status} - {e.data}")
+
+        # Same shape as `gh issue view --json title,body,labels,state,assignees,url`
+        issue = {
+            "title": data["title"],
+            "body": data.get("body") or "",
+            "labels": [{"name": label["name"]} for label in data.get("labels", [])],
+            "state": data["state"].upper(),
+            "assignees": [{"login": user["login"]} for user in data.get("assignees", [])],
+            "url": data["html_url"],
+        }
+        self.log(f"Issue: {issue['title']}")
+        self.log(f"State: {issue['state']}")
 
-            # Check if issue is already assigned
-            if issue.get('assignees'):
-                assignee_logins = [a['login'] for a in issue['assignees']]
-                self.log(f"Issue already assigned to: {', '.join(assignee_logins)}", "WARNING")
+        # Check if issue is already assigned
+        if issue['assignees']:
+            assignee_logins = [a['login'] for a in issue['assignees']]
+            self.log(f"Issue already assigned to: {', '.join(assignee_logins)}", "WARNING")
 
-            return issue
-
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Failed to fetch issue: {e.stderr}")
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("GitHub API request timed out")
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"Failed to parse issue JSON: {e}")
+        self._cache.set(cache_key, issue, ttl=ISSUE_CACHE_TTL)
+        return issue
 
     def comment_on_issue(self, comment: str) -> None:
         """Post a comment on the GitHub issue"""
         if not self.config.github_comments:
             return
 
+        # Comments and labels are POSTed by path like the issue fetch - no
+        # PyGithub issue object, so no second GET of the issue
         try:
-            subprocess.run(
-                ["gh", "issue", "comment", str(self.issue_number), "--body", comment],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=30
-            )
+            self._github_post_json(f"{self._issue_path()}/comments", {"body": comment})
             self.log(f"Posted comment to issue")
-        except subprocess.CalledProcessError as e:
-            self.log(f"Failed to post comment: {e.stderr}", "WARNING")
-        except subprocess.TimeoutExpired:
-            self.log("Comment post timed out", "WARNING")
+        except GithubException as e:
+            self.log(f"Failed to post comment: {e.status} - {e.data}", "WARNING")
+        except Exception as e:
+            self.log(f"Failed to post comment: {e}", "WARNING")
+
+    def add_needs_help_label(self) -> None:
+        """Label the issue 'needs-help' for human review (best effort)"""
+        try:
+            self._github_post_json(f"{self._issue_path()}/labels", {"labels": ["needs-help"]})
+        except GithubException as e:
+            self.log(f"Failed to add needs-help label: {e.status} - {e.data}", "WARNING")
+        except Exception as e:
+            self.log(f"Failed to add needs-help label: {e}", "WARNING")
+
+    def _in_background(self, func: Callable[..., Any], *args: Any) -> None:
+        """Run a fire-and-forget GitHub call on the GitHub pool"""
+        self._background.append(self._gh_pool.submit(func, *args))
+
+    def _wait_background(self) -> None:
+        """Wait for all background GitHub calls to finish"""
+        for future in self._background:
+            try:
+                future.result()
+            except Exception as e:
+                self.log(f"Background GitHub call failed: {e}", "WARNING")
+        self._background.clear()
 
     def update_issue_progress(self, status: str) -> None:
-        """Update issue with progress status (rate-limited to every 5 minutes)"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_progress_time
+        """
+        Update issue with progress status (at most one comment every 5 minutes)
 
-        # Only post every 5 minutes
-        if time_since_last < 300:  # 5 minutes
+        Updates arriving inside the interval are coalesced: only the latest
+        status is kept and a timer posts it once the interval has passed.
+        """
+        # comment_on_issue() would drop it anyway - skip building the comment
+        if not self.config.github_comments:
             return
 
-        elapsed = (current_time - self.start_time) / 60
+        with self._progress_lock:
+            now_ns = time.monotonic_ns()
+            time_since_last = (now_ns - self.last_progress_ns) / 1e9
+
+            if time_since_last < PROGRESS_INTERVAL:
+                self._pending_progress = status
+                if self._progress_timer is None:
+                    self._progress_timer = threading.Timer(
+                        PROGRESS_INTERVAL - time_since_last, self._flush_progress
+                    )
+                    self._progress_timer.daemon = True
+                    self._progress_timer.start()
+                return
+
+            self._pending_progress = None
+            self.last_progress_ns = now_ns
+
+        self._post_progress(status, now_ns)
+
+    def _flush_progress(self) -> None:
+        """Post the latest coalesced progress status (timer callback)"""
+        with self._progress_lock:
+            status = self._pending_progress
+            self._pending_progress = None
+            self._progress_timer = None
+            if status is None:
+                return
+            now_ns = time.monotonic_ns()
+            self.last_progress_ns = now_ns
+
+        self._post_progress(status, now_ns)
+
+    def _cancel_progress(self) -> None:
+        """Drop any pending progress update - the final comment supersedes it"""
+        with self._progress_lock:
+            if self._progress_timer is not None:
+                self._progress_timer.cancel()
+                self._progress_timer = None
+            self._pending_progress = None
+
+    def _post_progress(self, status: str, now_ns: int) -> None:
+        """Build and post a progress comment"""
+        elapsed = (now_ns - self.start_ns) / 60e9
         comment = f"""
 ### Progress Update
 
@@ -667,14 +1320,41 @@ class AgentWorker:
 _This is an automated progress update. Updates are posted every 5 minutes._
 """
         self.comment_on_issue(comment)
-        self.last_progress_time = current_time
 
     # ========================================================================
     # Project Context Loading
     # ========================================================================
 
+    def _read_context_file(self, path: str) -> Optional[str]:
+        """
+        Read a context file, skipping it if it's missing or too large
+
+        Returns:
+            File contents, or None if the file wasn't read
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        size = st.st_size
+
+        if size > CONTEXT_FILE_MAX_BYTES:
+            self.log(
+                f"Skipping {os.path.basename(path)} ({size // 1024}KB > {CONTEXT_FILE_MAX_BYTES // 1024}KB limit)",
+                "WARNING"
+            )
+            return None
+
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
     def load_project_context(self) -> Dict[str, str]:
-        """Load project context from .quetrex/memory/ files"""
+        """
+        Load project context from .quetrex/memory/ files
+
+        Each file is stat'ed first; files over CONTEXT_FILE_MAX_BYTES are skipped.
+        """
         self.log("Loading project context...")
 
         context = {
@@ -685,50 +1365,47 @@ _This is an automated progress update. Updates are posted every 5 minutes._
             "documentation": ""
         }
 
+        # Plain string paths - these are one-shot checks, no need for Path objects
+        repo_dir = str(self.repo_path)
+        quetrex_dir = os.path.join(repo_dir, ".quetrex")
+        memory_dir = os.path.join(quetrex_dir, "memory")
+
         # Load .quetrex configuration if it exists
-        quetrex_dir = self.repo_path / ".quetrex"
-        if quetrex_dir.exists():
+        if os.path.exists(quetrex_dir):
             # Project overview
-            overview_file = quetrex_dir / "memory" / "project-overview.md"
-            if overview_file.exists():
-                context["overview"] = overview_file.read_text()
+            content = self._read_context_file(os.path.join(memory_dir, "project-overview.md"))
+            if content is not None:
+                context["overview"] = content
                 self.log("Loaded project overview")
 
             # Configuration
-            config_file = quetrex_dir / "config.yml"
-            if config_file.exists():
-                context["config"] = config_file.read_text()
+            content = self._read_context_file(os.path.join(quetrex_dir, "config.yml"))
+            if content is not None:
+                context["config"] = content
                 self.log("Loaded project config")
 
             # Architectural patterns (CRITICAL - NEW)
-            patterns_file = quetrex_dir / "memory" / "patterns.md"
-            if patterns_file.exists():
-                context["patterns"] = patterns_file.read_text()
+            content = self._read_context_file(os.path.join(memory_dir, "patterns.md"))
+            if content is not None:
+                context["patterns"] = content
                 self.log("✅ Loaded architectural patterns")
             else:
                 self.log("⚠️ No architectural patterns found")
 
             # Memory files (learnings, gotchas, decisions)
-            memory_dir = quetrex_dir / "memory"
-            if memory_dir.exists():
-                memory_parts = []
-                for memory_file in ["gotchas.md", "decisions.md"]:  # patterns.md loaded separately
-                    path = memory_dir / memory_file
-                    if path.exists():
-                        content = path.read_text()
-                        if len(content) > 100:  # Skip empty templates
-                            memory_parts.append(f"## {memory_file}\n\n{content}")
-                            self.log(f"Loaded {memory_file}")
-
-                if memory_parts:
-                    context["memory"] = "\n\n".join(memory_parts)
+            memory_parts = []
+            for memory_file in ["gotchas.md", "decisions.md"]:  # patterns.md loaded separately
+                content = self._read_context_file(os.path.join(memory_dir, memory_file))
+                if content is not None and len(content) > 100:  # Skip empty templates
+                    memory_parts.append(f"## {memory_file}\n\n{content}")
+                    self.log(f"Loaded {memory_file}")
+            context["memory"] = "\n\n".join(memory_parts)
 
         # Load key documentation files
-        docs_dir = self.repo_path / "docs"
-        if docs_dir.exists():
-            readme = self.repo_path / "README.md"
-            if readme.exists():
-                context["documentation"] += f"\n\n## README\n\n{readme.read_text()}"
+        if os.path.exists(os.path.join(repo_dir, "docs")):
+            content = self._read_context_file(os.path.join(repo_dir, "README.md"))
+            if content is not None:
+                context["documentation"] = f"\n\n## README\n\n{content}"
 
         return context
 
@@ -967,7 +1644,9 @@ _This is an automated progress update. Updates are posted every 5 minutes._
         - Better error handling and recovery
 
         Returns:
-            (returncode, stdout, stderr)
+            (returncode, stdout, stderr) - stdout is only the first 500 chars
+            and stderr the first 8KB; the full stdout is streamed to the log
+            as it arrives
         """
         if timeout is None:
             timeout = self.config.max_execution_time
@@ -1015,36 +1694,82 @@ _This is an automated progress update. Updates are posted every 5 minutes._
             env["DISABLE_AUTOUPDATER"] = "true"
             env["DISABLE_TELEMETRY"] = "true"
 
-            result = subprocess.run(
+            # Reserve rate limit budget BEFORE the request (input tokens only)
+            estimated_input_tokens = len(prompt) // 4  # Rough estimate: 4 chars per token
+            self._reserve_rate_limit(estimated_input_tokens)
+
+            # Stream output instead of buffering it until exit so long runs
+            # show progress in the telemetry log as it happens
+            proc = subprocess.Popen(
                 claude_cmd,
                 cwd=self.repo_path,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=timeout,
-                env=env
+                bufsize=1,
+                env=env,
+                start_new_session=(os.name != "nt")
             )
 
-            # Log output
-            if result.stdout:
-                self.log(f"Claude output:\n{result.stdout[:500]}")
+            stdout_head: List[str] = []  # First 500 chars only - the rest is just counted
+            stdout_head_len = 0
+            stderr_head: List[str] = []  # First 8KB only - the rest is drained and counted
+            stderr_head_len = 0
+            stdout_length = 0
+            stderr_length = 0
+
+            def read_stdout():
+                nonlocal stdout_length, stdout_head_len
+                for line in proc.stdout:
+                    if stdout_head_len < 500:
+                        chunk = line[:500 - stdout_head_len]
+                        stdout_head.append(chunk)
+                        stdout_head_len += len(chunk)
+                    stdout_length += len(line)
+                    self.log(f"Claude: {line.rstrip()}")
+
+            def read_stderr():
+                # Keep draining past the cap so Claude never blocks on a full pipe.
+                # Fixed-size reads, not lines - a huge newline-free stderr
+                # (progress bars, minified dumps) never sits in memory whole.
+                nonlocal stderr_length, stderr_head_len
+                for block in iter(lambda: proc.stderr.read(8192), ""):
+                    if stderr_head_len < 8192:
+                        chunk = block[:8192 - stderr_head_len]
+                        stderr_head.append(chunk)
+                        stderr_head_len += len(chunk)
+                    stderr_length += len(block)
+
+            readers = [
+                threading.Thread(target=read_stdout, name="claude-stdout", daemon=True),
+                threading.Thread(target=read_stderr, name="claude-stderr", daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+
+            try:
+                returncode = proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self._kill_process_tree(proc)
+                raise
+            finally:
+                for reader in readers:
+                    reader.join()
+
+            stdout = "".join(stdout_head)
+            stderr = "".join(stderr_head)
 
-            if result.stderr:
-                self.log(f"Claude stderr:\n{result.stderr[:500]}", "WARNING" if result.returncode == 0 else "ERROR")
+            if stderr:
+                self.log(f"Claude stderr:\n{stderr[:500]}", "WARNING" if returncode == 0 else "ERROR")
 
             # Track API usage (approximate from output)
             # Claude Code CLI doesn't provide detailed token counts, so we estimate
             # based on prompt length and output length
-            estimated_input_tokens = len(prompt) // 4  # Rough estimate: 4 chars per token
-            estimated_output_tokens = len(result.stdout) // 4
-
-            # Track for rate limiting (approximate)
-            self.rate_limiter.add_usage(estimated_input_tokens, estimated_output_tokens)
+            estimated_output_tokens = stdout_length // 4
 
             # Estimate cost using actual model pricing
-            model_pricing = MODELS.get(model, MODELS['sonnet'])
-            input_cost = (estimated_input_tokens * model_pricing['input_cost'] / 1_000_000)
-            output_cost = (estimated_output_tokens * model_pricing['output_cost'] / 1_000_000)
-            cost = input_cost + output_cost
+            cost_in, cost_out = TOKEN_COSTS.get(model, TOKEN_COSTS['sonnet'])
+            cost = estimated_input_tokens * cost_in + estimated_output_tokens * cost_out
             self.estimated_cost += cost
             self.api_calls += 1
 
@@ -1058,14 +1783,14 @@ _This is an automated progress update. Updates are posted every 5 minutes._
             self.log(f"💰 API Call: {estimated_input_tokens:,} in + {estimated_output_tokens:,} out = ${cost:.4f} ({model})")
 
             self.log_structured("claude_execution_complete", {
-                "returncode": result.returncode,
+                "returncode": returncode,
                 "api_calls": self.api_calls,
                 "cost": self.estimated_cost,
-                "stdout_length": len(result.stdout),
-                "stderr_length": len(result.stderr)
+                "stdout_length": stdout_length,
+                "stderr_length": stderr_length
             })
 
-            return (result.returncode, result.stdout, result.stderr)
+            return (returncode, stdout, stderr)
 
         except subprocess.TimeoutExpired:
             error_msg = f"Claude Code CLI execution timed out after {timeout}s"
@@ -1077,70 +1802,172 @@ _This is an automated progress update. Updates are posted every 5 minutes._
             self.log(error_msg, "ERROR")
             return (1, "", error_msg)
 
+    def _reserve_rate_limit(self, tokens: int) -> None:
+        """
+        Record tokens against the rate limiter, waiting for room if needed
+
+        Args:
+            tokens: Estimated INPUT tokens for the upcoming request
+        """
+        for attempt in range(self.rate_limit_retries):
+            ok, retry_after = self.rate_limiter.try_consume(tokens)
+            if ok:
+                return
+            self.log(
+                f"Rate limit: waiting {retry_after:.1f}s before request "
+                f"(attempt {attempt + 1}/{self.rate_limit_retries})",
+                "WARNING"
+            )
+            time.sleep(retry_after)
+
+        ok, _ = self.rate_limiter.try_consume(tokens)
+        if not ok:
+            # Out of retries - record the usage anyway and let the API decide
+            self.log("Rate limit: retries exhausted, proceeding with request", "WARNING")
+            self.rate_limiter.add_usage(tokens, 0)
+
+    def _kill_process_tree(self, proc: subprocess.Popen) -> None:
+        """
+        Kill a timed-out subprocess along with any children it spawned
+
+        Args:
+            proc: Process started in its own session (process group)
+        """
+        try:
+            if os.name != "nt":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+        proc.wait()
+
     # ========================================================================
     # Git Operations
     # ========================================================================
 
     def get_current_branch(self) -> str:
-        """Get current git branch name"""
-        result = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
+        """
+        Get current git branch name
 
-    def get_changed_files(self) -> List[str]:
-        """Get list of changed files"""
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "HEAD"],
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        files = [f for f in result.stdout.strip().split('\n') if f]
+        Cached for the run - the worker never switches branches. Anything that
+        does must call self._cache.invalidate("current_branch").
+        """
+        cached = self._cache.get("current_branch")
+        if cached is not None:
+            return cached
+
+        branch = self._read_head_branch()
+        if branch is None:
+            result = subprocess.run(
+                GIT_CURRENT_BRANCH_ARGV,
+                cwd=self.repo_path,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            branch = result.stdout.strip()
+
+        self._cache.set("current_branch", branch)
+        return branch
+
+    def _read_head_branch(self) -> Optional[str]:
+        """
+        Read the current branch straight from .git/HEAD without spawning git
+
+        Returns "" for a detached HEAD (same as `git branch --show-current`)
+        and None if HEAD can't be read, so the caller can fall back to git.
+        """
+        git_dir = self.repo_path / ".git"
+        try:
+            if git_dir.is_file():
+                # Worktree/submodule: .git is a "gitdir: <path>" pointer file
+                pointer = git_dir.read_text().strip()
+                if not pointer.startswith("gitdir:"):
+                    return None
+                git_dir = (self.repo_path / pointer[len("gitdir:"):].strip()).resolve()
+            head = (git_dir / "HEAD").read_text().strip()
+        except OSError:
+            return None
+
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+        if head.startswith("ref: "):
+            return None
+        return ""
+
+    def _git_status_porcelain(self) -> List[Tuple[str, str]]:
+        """
+        Get (status, path) for every uncommitted change with a single git call
+
+        Untracked files have status "??". The result is cached for 500ms since
+        has_changes() and get_changed_files() are usually called back to back.
+        """
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache[0] < 0.5:
+            return self._status_cache[1]
 
-        # Also check untracked files
         result = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
+            GIT_STATUS_ARGV,
             cwd=self.repo_path,
             capture_output=True,
             text=True,
             check=True
         )
-        untracked = [f for f in result.stdout.strip().split('\n') if f]
 
+        entries = []
+        fields = iter(result.stdout.split("\0"))
+        for field in fields:
+            if not field:
+                continue
+            status, path = field[:2], field[3:]
+            entries.append((status, path))
+            # Renames/copies are followed by the original path - skip it
+            if "R" in status or "C" in status:
+                next(fields, None)
+
+        self._status_cache = (now, entries)
+        return entries
+
+    def get_changed_files(self) -> List[str]:
+        """Get list of changed files (tracked changes first, then untracked)"""
+        entries = self._git_status_porcelain()
+        files = [path for status, path in entries if status != "??"]
+        untracked = [path for status, path in entries if status == "??"]
         return files + untracked
 
     def has_changes(self) -> bool:
-        """Check if there are any uncommitted changes"""
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return bool(result.stdout.strip())
+        """
+        Check if there are any uncommitted changes
+
+        Shares _git_status_porcelain()'s cached result, so the usual
+        has_changes() + get_changed_files() pair costs one git status.
+        (`git diff --quiet` would be cheaper but misses untracked files.)
+        """
+        return bool(self._git_status_porcelain())
 
     def commit_changes(self, message: str) -> None:
         """Commit all changes with the given message"""
-        # Add all changes
-        subprocess.run(
-            ["git", "add", "."],
-            cwd=self.repo_path,
-            check=True
-        )
-
-        # Commit
-        subprocess.run(
-            ["git", "commit", "-m", message],
-            cwd=self.repo_path,
-            check=True
-        )
+        if os.name != "nt" and self._check_command_exists("bash"):
+            # Add + commit in a single process instead of two git spawns
+            subprocess.run(
+                ["bash", "-c", f"git add . && git commit -m {shlex.quote(message)}"],
+                cwd=self.repo_path,
+                check=True
+            )
+        else:
+            # No POSIX shell (Windows) - run the two git commands separately
+            subprocess.run(
+                ["git", "add", "."],
+                cwd=self.repo_path,
+                check=True
+            )
+            subprocess.run(
+                ["git", "commit", "-m", message],
+                cwd=self.repo_path,
+                check=True
+            )
+        self._status_cache = None
 
         self.log("Changes committed")
 
@@ -1162,24 +1989,16 @@ _This is an automated progress update. Updates are posted every 5 minutes._
         self.log("Running build...")
 
         # Try common build commands
-        build_commands = [
-            "npm run build",
-            "yarn build",
-            "pnpm build",
-            "cargo build",
-            "make build"
-        ]
-
-        for cmd in build_commands:
+        for argv in BUILD_COMMANDS:
             # Check if command is available
-            first_cmd = cmd.split()[0]
-            if not self._check_command_exists(first_cmd):
+            if not self._check_command_exists(argv[0]):
                 continue
 
+            cmd = " ".join(argv)
             try:
                 result = subprocess.run(
-                    cmd,
-                    shell=True,
+                    argv,
+                    shell=(os.name == "nt"),  # npm/yarn are .cmd shims on Windows
                     cwd=self.repo_path,
                     capture_output=True,
                     text=True,
@@ -1206,24 +2025,16 @@ _This is an automated progress update. Updates are posted every 5 minutes._
         self.log("Running tests...")
 
         # Try common test commands
-        test_commands = [
-            "npm test",
-            "yarn test",
-            "pnpm test",
-            "cargo test",
-            "make test"
-        ]
-
-        for cmd in test_commands:
+        for argv in TEST_COMMANDS:
             # Check if command is available
-            first_cmd = cmd.split()[0]
-            if not self._check_command_exists(first_cmd):
+            if not self._check_command_exists(argv[0]):
                 continue
 
+            cmd = " ".join(argv)
             try:
                 result = subprocess.run(
-                    cmd,
-                    shell=True,
+                    argv,
+                    shell=(os.name == "nt"),  # npm/yarn are .cmd shims on Windows
                     cwd=self.repo_path,
                     capture_output=True,
                     text=True,
@@ -1245,27 +2056,23 @@ _This is an automated progress update. Updates are posted every 5 minutes._
         self.log("No test command found, skipping", "WARNING")
         return True, "No test command"
 
+    def _lint_argv(self) -> Optional[Tuple[str, ...]]:
+        """The first LINT_COMMANDS entry whose tool is installed, or None"""
+        for argv in LINT_COMMANDS:
+            if self._check_command_exists(argv[0]):
+                return argv
+        return None
+
     def run_lint(self) -> Tuple[bool, str]:
         """Run linting"""
         self.log("Running linting...")
 
-        lint_commands = [
-            "npm run lint",
-            "yarn lint",
-            "pnpm lint",
-            "cargo clippy",
-            "make lint"
-        ]
-
-        for cmd in lint_commands:
-            first_cmd = cmd.split()[0]
-            if not self._check_command_exists(first_cmd):
-                continue
-
+        argv = self._lint_argv()
+        if argv is not None:
             try:
                 result = subprocess.run(
-                    cmd,
-                    shell=True,
+                    argv,
+                    shell=(os.name == "nt"),  # npm/yarn are .cmd shims on Windows
                     cwd=self.repo_path,
                     capture_output=True,
                     text=True,
@@ -1301,75 +2108,89 @@ _This is an automated progress update. Updates are posted every 5 minutes._
         # Build PR description
         pr_title = f"Fix: {issue['title']}"
 
-        elapsed = (time.time() - self.start_time) / 60
-        changed_files = self.get_changed_files()
-
-        pr_body = f"""Resolves #{self.issue_number}
-
-## Changes
-
-This PR implements the feature/fix described in issue #{self.issue_number}.
-
-**Files Changed:** {len(changed_files)}
-**Time Taken:** {elapsed:.1f} minutes
-**API Calls:** {self.api_calls}
-**Estimated Cost:** ${self.estimated_cost:.2f}
-
-## Testing
-
-- Build: Passed
-{"- Tests: Passed" if self.config.require_tests else "- Tests: Skipped (not required)"}
-- Lint: Checked
-
-## Changed Files
+        elapsed = self.elapsed_seconds() / 60
 
-{chr(10).join(f"- {f}" for f in changed_files[:20])}
-{f"... and {len(changed_files) - 20} more" if len(changed_files) > 20 else ""}
-
----
-
-This PR was created by Glen Barnhardt with the help of Claude Code
+        changed_files = self.get_changed_files()
 
-🤖 Generated by Quetrex AI Agent
-"""
+        body_parts: List[str] = [
+            f"Resolves #{self.issue_number}",
+            "",
+            "## Changes",
+            "",
+            f"This PR implements the feature/fix described in issue #{self.issue_number}.",
+            "",
+            f"**Files Changed:** {len(changed_files)}",
+            f"**Time Taken:** {elapsed:.1f} minutes",
+            f"**API Calls:** {self.api_calls}",
+            f"**Estimated Cost:** ${self.estimated_cost:.2f}",
+            "",
+            "## Testing",
+            "",
+            "- Build: Passed",
+            "- Tests: Passed" if self.config.require_tests else "- Tests: Skipped (not required)",
+            "- Lint: Checked",
+            "",
+            "## Changed Files",
+            "",
+        ]
+        body_parts.extend(f"- {f}" for f in changed_files[:20])
+        body_parts.extend([
+            f"... and {len(changed_files) - 20} more" if len(changed_files) > 20 else "",
+            "",
+            "---",
+            "",
+            "This PR was created by Glen Barnhardt with the help of Claude Code",
+            "",
+            "🤖 Generated by Quetrex AI Agent",
+            "",
+        ])
+        pr_body = "\n".join(body_parts)
 
         try:
-            # Get repository info
+            # Get repository info (cached since the issue fetch)
             repo_info = self.get_repo_info()
             repo_name = f"{repo_info['owner']}/{repo_info['repo']}"
 
-            github_token = self.config.github_token
-
-            # Initialize PyGithub
-            gh = Github(github_token)
-            repo = gh.get_repo(repo_name)
+            # Reuse the shared PyGithub client and repo
+            repo = self._get_repo()
 
             self.log(f"Creating PR on {repo_name}: {branch} -> main")
 
-            # Check if PR already exists for this branch
+            # Create new pull request - only look for an existing PR if GitHub
+            # rejects this one (422), which saves a round trip in the common case
             try:
-                existing_prs = repo.get_pulls(state='open', head=f"{repo_info['owner']}:{branch}")
-                if existing_prs.totalCount > 0:
-                    existing_pr = existing_prs[0]
-                    self.log(f"PR already exists: #{existing_pr.number}", "WARNING")
-                    return {
-                        "number": existing_pr.number,
-                        "url": existing_pr.html_url
-                    }
+                pr = self._with_github_retry(
+                    repo.create_pull,
+                    title=pr_title,
+                    body=pr_body,
+                    base="main",
+                    head=branch
+                )
             except GithubException as e:
-                self.log(f"Error checking existing PRs: {e}", "WARNING")
-
-            # Create new pull request
-            pr = repo.create_pull(
-                title=pr_title,
-                body=pr_body,
-                base="main",
-                head=branch
-            )
+                if e.status != 422:
+                    raise
+
+                # Check if PR already exists for this branch
+                try:
+                    existing_pr = self._with_github_retry(
+                        lambda: next(iter(repo.get_pulls(state='open', head=f"{repo_info['owner']}:{branch}")), None)
+                    )
+                except GithubException as lookup_error:
+                    self.log(f"Error checking existing PRs: {lookup_error}", "WARNING")
+                    existing_pr = None
+
+                if existing_pr is None:
+                    raise
+
+                self.log(f"PR already exists: #{existing_pr.number}", "WARNING")
+                return {
+                    "number": existing_pr.number,
+                    "url": existing_pr.html_url
+                }
 
             # Add labels
             try:
-                pr.add_to_labels("ai-generated", "ready-for-review")
+                self._with_github_retry(pr.add_to_labels, "ai-generated", "ready-for-review")
             except GithubException as e:
                 self.log(f"Failed to add labels (non-fatal): {e}", "WARNING")
 
@@ -1431,6 +2252,9 @@ This PR was created by Glen Barnhardt with the help of Claude Code
                 f"max {self.rate_limit_retries} retries{test_mode_msg}"
             )
 
+            # The issue fetch doesn't depend on the local checks below - start it now
+            issue_future = self._gh_pool.submit(self.get_issue_details)
+
             # Phase 0: Environment check
             self.log("Phase 0: Environment validation")
             self.check_constraints()
@@ -1442,13 +2266,13 @@ This PR was created by Glen Barnhardt with the help of Claude Code
 
             # Phase 1: Fetch issue
             self.log("Phase 1: Fetching issue details")
-            issue = self.get_issue_details()
+            issue = issue_future.result()
 
-            # Validate issue has required label
-            labels = [label['name'] for label in issue.get('labels', [])]
-            if 'ai-feature' not in labels:
+            # Validate issue has required label - the cheapest check, so it
+            # gates model selection, the start comment and all Claude work
+            if not any(label['name'] == REQUIRED_LABEL for label in issue.get('labels', [])):
                 raise RuntimeError(
-                    f"Issue #{self.issue_number} does not have 'ai-feature' label"
+                    f"Issue #{self.issue_number} does not have '{REQUIRED_LABEL}' label"
                 )
 
             # Select appropriate model based on issue complexity
@@ -1457,8 +2281,9 @@ This PR was created by Glen Barnhardt with the help of Claude Code
             self.log(f"Selected model: {selected_model} (${model_info['input_cost']}/{model_info['output_cost']} per 1M tokens)")
             result["model"] = selected_model
 
-            # Comment on issue
-            self.comment_on_issue(
+            # Comment on issue (posted in the background while context loads)
+            self._in_background(
+                self.comment_on_issue,
                 f"🤖 AI agent has started working on this issue.\n\n"
                 f"**Branch:** `{branch}`\n"
                 f"**Model:** `{selected_model}` (auto-selected based on complexity)\n\n"
@@ -1477,119 +2302,133 @@ This PR was created by Glen Barnhardt with the help of Claude Code
             max_retries = 3
             current_prompt = prompt
             last_error = None
+            lint_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lint")
+            lint_future: Optional[Future] = None
 
-            for attempt in range(max_retries):
-                attempt_num = attempt + 1
-                self.log(f"Phase 4: Executing Claude Code CLI (attempt {attempt_num}/{max_retries})")
-                self.update_issue_progress(f"Implementing changes with Claude (attempt {attempt_num})...")
-
-                returncode, stdout, stderr = self.execute_claude_code(current_prompt, model=selected_model)
-
-                if returncode != 0:
-                    self.log(f"Claude execution failed with code {returncode}", "ERROR")
-                    self.log(f"STDERR: {stderr[:500]}", "ERROR")
-                    raise RuntimeError(f"Claude execution failed: {stderr[:200]}")
-
-                # Phase 5: Verify changes
-                self.log("Phase 5: Verifying changes")
-
-                if not self.has_changes():
-                    self.log("No changes were made", "WARNING")
-                    self.comment_on_issue(
-                        "The AI agent completed execution but no changes were made. "
-                        "This may indicate that:\n"
-                        "1. The issue requirements were unclear\n"
-                        "2. The requested changes already exist\n"
-                        "3. The agent encountered an issue\n\n"
-                        "This issue has been labeled 'needs-help' for human review."
-                    )
-                    subprocess.run(
-                        ["gh", "issue", "edit", str(self.issue_number), "--add-label", "needs-help"],
-                        cwd=self.repo_path,
-                        capture_output=True
-                    )
-                    raise RuntimeError("No changes made")
-
-                changed_files = self.get_changed_files()
-                self.files_changed = set(changed_files)
-                result["files_changed"] = len(changed_files)
-
-                self.log(f"Changes detected in {len(changed_files)} files")
-                self.check_constraints()
-
-                # Phase 6: Run build and tests
-                self.log("Phase 6: Running build and tests")
-                self.update_issue_progress("Running build and tests...")
-
-                build_passed, build_output = self.run_build()
-
-                if build_passed:
-                    self.log("Build passed!")
-                    last_error = None
-                    break  # Success - exit retry loop
-                else:
-                    last_error = build_output
-                    self.log(f"Build failed on attempt {attempt_num}", "ERROR")
-
-                    if attempt_num < max_retries:
-                        # Create fix prompt with error context
-                        self.log(f"Creating fix prompt for retry {attempt_num + 1}")
-                        self.update_issue_progress(f"Build failed, retrying with fix (attempt {attempt_num + 1})...")
-
-                        # DO NOT reset changes - keep original implementation and fix the error
-                        # The error is likely in the code we just wrote, so we need to fix it in place
-
-                        # Build a new prompt with the error context - asking to FIX the current code
-                        current_prompt = f"""The implementation has a build error that needs to be fixed IN PLACE. DO NOT start over.
-
-## Build Error (MUST FIX)
-```
-{build_output[:1500]}
-```
-
-## Instructions
-1. Read the error message carefully - it shows the exact file and line number
-2. The error is in YOUR changes - fix the type error or missing property
-3. Use the Edit tool to fix ONLY the problematic line(s)
-4. DO NOT revert or rewrite - just fix the specific error
-
-IMPORTANT: Keep all other changes intact. Only fix the build error."""
+            try:
+                for attempt in range(max_retries):
+                    attempt_num = attempt + 1
+                    self.log(f"Phase 4: Executing Claude Code CLI (attempt {attempt_num}/{max_retries})")
+                    self.update_issue_progress(f"Implementing changes with Claude (attempt {attempt_num})...")
+
+                    returncode, stdout, stderr = self.execute_claude_code(current_prompt, model=selected_model)
+
+                    if returncode != 0:
+                        self.log(f"Claude execution failed with code {returncode}", "ERROR")
+                        self.log(f"STDERR: {stderr[:500]}", "ERROR")
+                        raise RuntimeError(f"Claude execution failed: {stderr[:200]}")
+
+                    # Phase 5: Verify changes
+                    self.log("Phase 5: Verifying changes")
+
+                    if not self.has_changes():
+                        self.log("No changes were made", "WARNING")
+                        self.comment_on_issue(
+                            "The AI agent completed execution but no changes were made. "
+                            "This may indicate that:\n"
+                            "1. The issue requirements were unclear\n"
+                            "2. The requested changes already exist\n"
+                            "3. The agent encountered an issue\n\n"
+                            "This issue has been labeled 'needs-help' for human review."
+                        )
+                        self.add_needs_help_label()
+                        raise RuntimeError("No changes made")
+
+                    changed_files = self.get_changed_files()
+                    self.files_changed = set(changed_files)
+                    changed_exts = {os.path.splitext(f)[1].lower() for f in self.files_changed}
+                    result["files_changed"] = len(self.files_changed)
+
+                    self.log(f"Changes detected in {result['files_changed']} files")
+                    self.check_constraints()
+
+                    # Phase 6: Run build and tests
+                    self.log("Phase 6: Running build and tests")
+                    self.update_issue_progress("Running build and tests...")
+
+                    # Lint doesn't need build artifacts - run it alongside the build
+                    # when the linter won't contend with the build for the tree
+                    lint_argv = self._lint_argv() if self.config.parallel_lint else None
+                    if changed_exts & LINT_EXTENSIONS and lint_argv and lint_argv[0] in PARALLEL_LINT_TOOLS:
+                        lint_future = lint_pool.submit(self.run_lint)
+
+                    build_passed, build_output = self.run_build()
+
+                    if build_passed:
+                        self.log("Build passed!")
+                        last_error = None
+                        break  # Success - exit retry loop
                     else:
-                        self.log(f"All {max_retries} attempts failed", "ERROR")
-
-            # Check if we exited due to persistent failure
-            if last_error:
-                raise RuntimeError(f"Build failed after {max_retries} attempts:\n{last_error[:500]}")
-
-            if self.config.require_tests:
-                tests_passed, test_output = self.run_tests()
-                if not tests_passed:
-                    raise RuntimeError(f"Tests failed:\n{test_output[:500]}")
-
-            # Run linting (non-blocking)
-            lint_passed, lint_output = self.run_lint()
-            if not lint_passed:
-                self.log("Linting issues detected (non-blocking)", "WARNING")
+                        last_error = build_output
+                        self.log(f"Build failed on attempt {attempt_num}", "ERROR")
+
+                        # The code is about to change again - this lint result is stale
+                        if lint_future is not None:
+                            lint_future.result()
+                            lint_future = None
+
+                        if attempt_num < max_retries:
+                            # Create fix prompt with error context
+                            self.log(f"Creating fix prompt for retry {attempt_num + 1}")
+                            self.update_issue_progress(f"Build failed, retrying with fix (attempt {attempt_num + 1})...")
+
+                            # DO NOT reset changes - keep original implementation and fix the error
+                            # The error is likely in the code we just wrote, so we need to fix it in place
+
+                            # Build a new prompt with the error context - asking to FIX the current code
+                            current_prompt = f"""The implementation has a build error that needs to be fixed IN PLACE. DO NOT start over.
+
+    ## Build Error (MUST FIX)
+    ```
+    {build_output[:1500]}
+    ```
+
+    ## Instructions
+    1. Read the error message carefully - it shows the exact file and line number
+    2. The error is in YOUR changes - fix the type error or missing property
+    3. Use the Edit tool to fix ONLY the problematic line(s)
+    4. DO NOT revert or rewrite - just fix the specific error
+
+    IMPORTANT: Keep all other changes intact. Only fix the build error."""
+                        else:
+                            self.log(f"All {max_retries} attempts failed", "ERROR")
+
+                # Check if we exited due to persistent failure
+                if last_error:
+                    raise RuntimeError(f"Build failed after {max_retries} attempts:\n{last_error[:500]}")
+
+                if self.config.require_tests:
+                    if changed_exts <= NON_CODE_EXTENSIONS:
+                        self.log("Only docs/assets changed, skipping tests")
+                    else:
+                        tests_passed, test_output = self.run_tests()
+                        if not tests_passed:
+                            raise RuntimeError(f"Tests failed:\n{test_output[:500]}")
+
+                # Run linting (non-blocking)
+                if changed_exts & LINT_EXTENSIONS:
+                    if lint_future is not None:
+                        lint_passed, lint_output = lint_future.result()
+                    else:
+                        lint_passed, lint_output = self.run_lint()
+                    if not lint_passed:
+                        self.log("Linting issues detected (non-blocking)", "WARNING")
+                else:
+                    self.log("No lintable files changed, skipping linting")
+            finally:
+                # Failure paths raise with lint possibly still running - don't wait on it
+                lint_pool.shutdown(wait=False, cancel_futures=True)
 
             # Phase 7: Commit and push (if not already done by Claude Code)
             self.log("Phase 7: Committing and pushing changes")
 
             if self.has_changes():
-                commit_message = f"""Fix: {issue['title']}
-
-Implements #{self.issue_number}
-
-This commit implements the feature/fix described in issue #{self.issue_number}.
-
-Changes:
-{chr(10).join(f"- {f}" for f in changed_files[:10])}
-{f"... and {len(changed_files) - 10} more" if len(changed_files) > 10 else ""}
-
-This commit was created by Glen Barnhardt with the help of Claude Code
-
-Generated by Quetrex AI Agent
-Co-Authored-By: Claude <noreply@anthropic.com>
-"""
+                commit_message = COMMIT_TEMPLATE.substitute(
+                    title=issue['title'],
+                    issue_number=self.issue_number,
+                    files="\n".join(map("- {}".format, changed_files[:10])),
+                    more=f"... and {len(changed_files) - 10} more" if len(changed_files) > 10 else ""
+                )
                 self.commit_changes(commit_message)
                 self.push_changes(branch)
             else:
@@ -1598,6 +2437,8 @@ Co-Authored-By: Claude <noreply@anthropic.com>
             # Phase 8: Create pull request
             self.log("Phase 8: Creating pull request")
             pr = self.create_pull_request(issue, branch)
+            duration_seconds = self.elapsed_seconds()
+            self._cancel_progress()
 
             if pr:
                 result["pr_number"] = pr["number"]
@@ -1610,7 +2451,7 @@ Co-Authored-By: Claude <noreply@anthropic.com>
                     f"- Files changed: {len(changed_files)}\n"
                     f"- API calls: {self.api_calls}\n"
                     f"- Estimated cost: ${self.estimated_cost:.2f}\n"
-                    f"- Duration: {(time.time() - self.start_time) / 60:.1f} minutes"
+                    f"- Duration: {duration_seconds / 60:.1f} minutes"
                 )
             else:
                 self.log("Failed to create PR", "WARNING")
@@ -1622,17 +2463,19 @@ Co-Authored-By: Claude <noreply@anthropic.com>
                     f"- Files changed: {len(changed_files)}\n"
                     f"- API calls: {self.api_calls}\n"
                     f"- Estimated cost: ${self.estimated_cost:.2f}\n"
-                    f"- Duration: {(time.time() - self.start_time) / 60:.1f} minutes"
+                    f"- Duration: {duration_seconds / 60:.1f} minutes"
                 )
 
             # Success!
             result["status"] = "success"
             result["api_calls"] = self.api_calls
             result["estimated_cost"] = self.estimated_cost
-            result["duration_seconds"] = int(time.time() - self.start_time)
+            result["duration_seconds"] = int(duration_seconds)
             result["input_tokens"] = getattr(self, 'total_input_tokens', 0)
             result["output_tokens"] = getattr(self, 'total_output_tokens', 0)
 
+            self._wait_background()
+
             self.log("="*80)
             self.log(f"✅ Agent completed successfully!")
             self.log(f"Duration: {result['duration_seconds'] / 60:.1f} minutes")
@@ -1648,14 +2491,19 @@ Co-Authored-By: Claude <noreply@anthropic.com>
             result["error"] = error_msg
             result["api_calls"] = self.api_calls
             result["estimated_cost"] = self.estimated_cost
-            result["duration_seconds"] = int(time.time() - self.start_time)
+            result["duration_seconds"] = int(self.elapsed_seconds())
 
             self.log("="*80)
             self.log(f"Agent failed: {error_msg}", "ERROR")
             self.log("="*80)
 
-            # Comment on issue
-            self.comment_on_issue(
+            # Let the start comment land first so the issue thread stays in order
+            self._cancel_progress()
+            self._wait_background()
+
+            # Comment on issue and add needs-help label (independent - run together)
+            self._in_background(
+                self.comment_on_issue,
                 f"AI agent encountered an error:\n\n"
                 f"```\n{error_msg}\n```\n\n"
                 f"**Metrics:**\n"
@@ -1664,17 +2512,8 @@ Co-Authored-By: Claude <noreply@anthropic.com>
                 f"- Duration: {result['duration_seconds'] / 60:.1f} minutes\n\n"
                 f"This issue has been labeled 'needs-help' and requires human attention."
             )
-
-            # Add needs-help label
-            try:
-                subprocess.run(
-                    ["gh", "issue", "edit", str(self.issue_number), "--add-label", "needs-help"],
-                    cwd=self.repo_path,
-                    capture_output=True,
-                    timeout=10
-                )
-            except:
-                pass
+            self._in_background(self.add_needs_help_label)
+            self._wait_background()
 
             return result
 
@@ -1683,6 +2522,32 @@ Co-Authored-By: Claude <noreply@anthropic.com>
 # CLI Entry Point
 # ============================================================================
 
+def dumps_result(result: Dict[str, Any]) -> bytes:
+    """
+    Pretty-print a result dict as UTF-8 JSON (orjson when available)
+
+    Both paths emit `"key": value` with a space after the colon - the workflow
+    greps agent output for `"pr_url": "..."`.
+    """
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    return json.dumps(result, indent=2).encode()
+
+
+def write_stdout(data: bytes) -> None:
+    """
+    Write bytes straight to the stdout file descriptor
+
+    One write for the whole block keeps it from interleaving with child
+    process output in CI logs. Anything already buffered in sys.stdout is
+    flushed first so ordering is preserved.
+    """
+    sys.stdout.flush()
+    view = memoryview(data)
+    while view:
+        view = view[os.write(sys.stdout.fileno(), view):]
+
+
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
@@ -1696,6 +2561,7 @@ def main():
         print("  CLAUDE_REQUIRE_TESTS (default: false)", file=sys.stderr)
         print("  CLAUDE_GITHUB_COMMENTS (default: true)", file=sys.stderr)
         print("  CLAUDE_LOG_API_CALLS (default: true)", file=sys.stderr)
+        print("  CLAUDE_PARALLEL_LINT (default: true)", file=sys.stderr)
         print("  CLAUDE_RATE_LIMIT_TPM (default: 20000)", file=sys.stderr)
         print("  CLAUDE_RATE_LIMIT_RETRIES (default: 3)", file=sys.stderr)
         print("  CLAUDE_RATE_LIMIT_THRESHOLD (default: 0.8)", file=sys.stderr)
@@ -1719,30 +2585,30 @@ def main():
         # Create and run agent
         worker = AgentWorker(issue_number, repo_path)
         result = worker.run()
+        worker.close_log()  # Don't interleave queued log lines with the summary
 
-        # Output cost summary banner
-        print("\n" + "="*80)
-        print("💰 COST SUMMARY")
-        print("="*80)
+        # Output cost summary banner and full result as one write
         model_used = result.get("model", "sonnet")
         model_info = MODELS.get(model_used, MODELS['sonnet'])
         input_tokens = result.get("input_tokens", 0)
         output_tokens = result.get("output_tokens", 0)
         total_cost = result.get("estimated_cost", 0)
 
-        print(f"  Issue:        #{result.get('issue_number', '?')}")
-        print(f"  Model:        {model_used} (${model_info['input_cost']}/{model_info['output_cost']} per 1M)")
-        print(f"  API Calls:    {result.get('api_calls', 0)}")
-        print(f"  Input:        {input_tokens:,} tokens")
-        print(f"  Output:       {output_tokens:,} tokens")
-        print(f"  ─────────────────────────")
-        print(f"  TOTAL COST:   ${total_cost:.4f}")
-        print("="*80)
-
-        # Output full result as JSON
-        print("\nRESULT:")
-        print(json.dumps(result, indent=2))
-        print("="*80)
+        summary = (
+            f"\n{'=' * 80}\n"
+            f"💰 COST SUMMARY\n"
+            f"{'=' * 80}\n"
+            f"  Issue:        #{result.get('issue_number', '?')}\n"
+            f"  Model:        {model_used} (${model_info['input_cost']}/{model_info['output_cost']} per 1M)\n"
+            f"  API Calls:    {result.get('api_calls', 0)}\n"
+            f"  Input:        {input_tokens:,} tokens\n"
+            f"  Output:       {output_tokens:,} tokens\n"
+            f"  ─────────────────────────\n"
+            f"  TOTAL COST:   ${total_cost:.4f}\n"
+            f"{'=' * 80}\n"
+            f"\nRESULT:\n"
+        )
+        write_stdout(summary.encode() + dumps_result(result) + b"\n" + b"=" * 80 + b"\n")
 
         # Exit with appropriate code
         sys.exit(0 if result["status"] == "success" else 1)
@@ -1764,7 +2630,7 @@ def main():
         print(str(e), file=sys.stderr)
         print("="*80, file=sys.stderr)
 
-        print(json.dumps(error_result, indent=2))
+        write_stdout(dumps_result(error_result) + b"\n")
         sys.exit(1)
 
 
@@ -9,19 +9,65 @@ Usage:
     python3 architecture-scanner.py [path] [--format=json|markdown]
     python3 architecture-scanner.py .
     python3 architecture-scanner.py /path/to/project --format=markdown
+    python3 architecture-scanner.py . --jobs=1
+
+Optional dependencies:
+    google-re2    Linear-time regex engine for the pattern scan (falls back to re)
+    orjson        Faster JSON report output (falls back to json)
+    pyahocorasick One-pass literal prefilter for all patterns (falls back to
+                  a substring search per needle)
 """
 
 import os
 import re
 import json
+import mmap
+import hashlib
+import io
 import sys
+import tempfile
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from enum import IntEnum
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# RE2 (optional) runs in linear time - no catastrophic backtracking on odd input
+try:
+    import re2 as re_engine
+except ImportError:
+    re_engine = re
+
+# orjson (optional) is a faster encoder for the JSON report and the scan cache
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyahocorasick (optional) finds every prefilter literal in a single walk
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
+class Level(IntEnum):
+    """Confidence / severity level - ordered, and compared as an int"""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
 
-@dataclass
+
+def level_names(fields: List[Tuple[str, object]]) -> Dict[str, object]:
+    """asdict() dict_factory that emits Level values by name ('HIGH')"""
+    return {key: value.name if isinstance(value, Level) else value for key, value in fields}
+
+
+@dataclass(slots=True, frozen=True)
 class PatternUsage:
     """Represents a detected usage of an architectural pattern"""
     pattern_id: str
@@ -29,22 +75,22 @@ class PatternUsage:
     category: str
     file_path: str
     line_numbers: List[int]
-    confidence: str  # HIGH, MEDIUM, LOW
+    confidence: Level
     code_snippet: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArchitectureConflict:
     """Represents a conflict where multiple patterns exist for the same problem"""
     category: str
-    severity: str  # HIGH, MEDIUM, LOW
+    severity: Level
     description: str
     patterns_found: Dict[str, int]  # pattern_name: count
     affected_files: List[str]
     recommendation: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArchitectureReport:
     """Complete architecture analysis report"""
     patterns_found: Dict[str, List[PatternUsage]]
@@ -54,11 +100,324 @@ class ArchitectureReport:
     summary: Dict
 
 
+# Source patterns in report order:
+#   (group, pattern_id, pattern_name, category, regex, confidence, needles)
+# Regexes run over the raw bytes of the whole file, so they must be ASCII and
+# must not match across lines ([^\S\n] instead of \s) - a match's line number
+# is the line it starts on. They must also stay RE2-compatible: no
+# backreferences or lookaround.
+#
+# needles are literals of which every match contains at least one: a file with
+# none of them can't match, so the regex is skipped. None for patterns that
+# have no such literal (case-insensitive ones).
+PATTERNS = [
+    # Data fetching patterns
+    ('sse', 'pattern-sse-reactive-data', 'Server-Sent Events', 'data_fetching',
+     r'(?i:EventSource|text/event-stream|ReadableStream)', Level.HIGH,
+     None),
+    ('tauri', 'pattern-tauri-events-reactive', 'Tauri Events', 'data_fetching',
+     r'listen<|emit|emit_all|@tauri-apps/api/event', Level.HIGH,
+     (b'listen<', b'emit', b'@tauri-apps/api/event')),
+    ('rsc', 'pattern-rsc-data-fetching', 'React Server Components', 'data_fetching',
+     r'export[^\S\n]+default[^\S\n]+async[^\S\n]+function[^\S\n]+\w+Page|await[^\S\n]+fetch\(|await[^\S\n]+db\.', Level.HIGH,
+     (b'export', b'await')),
+    # Fetch in useEffect (anti-pattern to detect)
+    ('fetch_effect', 'pattern-fetch-in-useeffect', 'Fetch in useEffect (Anti-pattern)', 'data_fetching',
+     r'useEffect.*fetch\(', Level.MEDIUM,
+     (b'useEffect',)),
+    # Polling (potential anti-pattern)
+    ('polling', 'pattern-polling', 'Polling with setInterval', 'data_fetching',
+     r'setInterval.*(?:fetch|axios)', Level.MEDIUM,
+     (b'setInterval',)),
+
+    # State management patterns
+    ('react_query', 'pattern-react-query-state', 'React Query', 'state_management',
+     r'useQuery|useMutation|QueryClientProvider|@tanstack/react-query', Level.HIGH,
+     (b'useQuery', b'useMutation', b'QueryClientProvider', b'@tanstack/react-query')),
+    ('usestate', 'pattern-usestate-local-ui', 'useState', 'state_management',
+     r'useState<[^>\n]*>\(|useState\(', Level.HIGH,
+     (b'useState',)),
+    ('context', 'pattern-context-shared-ui', 'React Context', 'state_management',
+     r'createContext|useContext|\.Provider', Level.HIGH,
+     (b'createContext', b'useContext', b'.Provider')),
+    ('zustand', 'pattern-zustand-state', 'Zustand', 'state_management',
+     r'create\(.*\)|useStore', Level.HIGH,
+     (b'create(', b'useStore')),
+
+    # API design patterns
+    ('zod', 'pattern-zod-validation', 'Zod Validation', 'api_design',
+     r'z\.object|z\.string|z\.number|\.parse\(|\.safeParse\(|from [\'"]zod[\'"]', Level.HIGH,
+     (b'z.object', b'z.string', b'z.number', b'.parse(', b'.safeParse(', b'zod')),
+    ('rest', 'pattern-rest-api-standard', 'REST API', 'api_design',
+     r'export[^\S\n]+async[^\S\n]+function[^\S\n]+(?:GET|POST|PATCH|PUT|DELETE)[^\S\n]*\(', Level.HIGH,
+     (b'async',)),
+
+    # Component architecture patterns
+    ('client', 'pattern-client-component-boundaries', 'Client Components', 'component_architecture',
+     r"'use client'", Level.HIGH,
+     (b"'use client'",)),
+
+    # Code quality patterns (anti-patterns)
+    ('any_type', 'pattern-any-type', 'TypeScript any (Anti-pattern)', 'code_quality',
+     r':[^\S\n]*any\b', Level.MEDIUM,
+     (b'any',)),
+    ('ts_ignore', 'pattern-ts-ignore', 'TypeScript @ts-ignore (Anti-pattern)', 'code_quality',
+     r'@ts-ignore|@ts-expect-error', Level.MEDIUM,
+     (b'@ts-ignore', b'@ts-expect-error')),
+
+    # Security patterns
+    ('env_validation', 'pattern-env-validation', 'Environment Variable Validation', 'security',
+     r'envSchema|z\.object.*API_KEY|validateEnv', Level.HIGH,
+     (b'envSchema', b'API_KEY', b'validateEnv')),
+    # Raw SQL (potential SQL injection risk)
+    ('raw_sql', 'pattern-raw-sql', 'Raw SQL Queries (Review for SQL Injection)', 'security',
+     r'\$queryRaw|\$executeRaw|\$queryRawUnsafe', Level.MEDIUM,
+     (b'$queryRaw', b'$executeRaw')),
+    # dangerouslySetInnerHTML (XSS risk)
+    ('dangerous_html', 'pattern-dangerous-html', 'dangerouslySetInnerHTML (XSS Risk)', 'security',
+     r'dangerouslySetInnerHTML', Level.MEDIUM,
+     (b'dangerouslySetInnerHTML',)),
+
+    # Performance patterns
+    ('next_image', 'pattern-nextjs-image-optimization', 'Next.js Image Component', 'performance',
+     r"from ['\"]next/image['\"]|<Image", Level.HIGH,
+     (b'next/image', b'<Image')),
+    # Regular img tags (anti-pattern)
+    ('img_tag', 'pattern-img-tag', 'Regular img tag (Anti-pattern)', 'performance',
+     r'<img[^\S\n]+', Level.MEDIUM,
+     (b'<img',)),
+
+    # Testing patterns
+    ('aaa', 'pattern-aaa-test-structure', 'AAA Test Structure', 'testing',
+     r'// ARRANGE|// ACT|// ASSERT', Level.HIGH,
+     (b'// ARRANGE', b'// ACT', b'// ASSERT')),
+]
+
+# group -> (pattern_id, pattern_name, category, confidence)
+PATTERN_INFO: Dict[str, Tuple[str, str, str, Level]] = {
+    group: (pattern_id, pattern_name, category, confidence)
+    for group, pattern_id, pattern_name, category, _, confidence, _ in PATTERNS
+}
+
+# Patterns that don't count in files containing the exclude literal
+PATTERN_EXCLUDES: Dict[str, bytes] = {
+    'rsc': b"'use client'",  # Exclude client components
+}
+
+
+# group -> compiled bytes regex. Python's re is a backtracking matcher: one pass
+# per pattern lets each use its fast literal-prefix search, which beats a single
+# alternation of all of them (measured ~2x faster on this repo).
+PATTERN_REGEXES: Dict[str, re.Pattern] = {p[0]: re_engine.compile(p[4].encode()) for p in PATTERNS}
+
+# group -> prefilter literals (None to always scan)
+PATTERN_NEEDLES: Dict[str, Optional[Tuple[bytes, ...]]] = {p[0]: p[6] for p in PATTERNS}
+
+
+def build_needle_automaton():
+    """
+    Build an Aho-Corasick automaton over every prefilter and exclude literal
+
+    Each literal maps to the groups it admits (or to ('exclude', group)).
+    pyahocorasick's default build only takes str keys, so literals are added
+    as latin-1 - file bytes decoded the same way keep 1:1 offsets.
+
+    Returns:
+        The automaton, or None if pyahocorasick isn't installed
+    """
+    if ahocorasick is None:
+        return None
+
+    payloads: Dict[bytes, List[Tuple[str, str]]] = defaultdict(list)
+    for group, needles in PATTERN_NEEDLES.items():
+        for needle in needles or ():
+            payloads[needle].append(('needle', group))
+    for group, needle in PATTERN_EXCLUDES.items():
+        payloads[needle].append(('exclude', group))
+
+    automaton = ahocorasick.Automaton()
+    for needle, payload in payloads.items():
+        automaton.add_word(needle.decode('latin-1'), tuple(payload))
+    automaton.make_automaton()
+    return automaton
+
+
+NEEDLE_AUTOMATON = build_needle_automaton()
+
+NEWLINE_RE = re.compile(rb'\n')
+
+# Files at least this big are memory-mapped instead of read into memory
+MMAP_MIN_BYTES = 1024 * 1024
+
+
+# Patterns in each category that are mutually exclusive. Names are frozensets
+# so the per-usage membership test is a hash lookup.
+CONFLICT_GROUPS = {
+    'data_fetching': {
+        'patterns': frozenset(['Server-Sent Events', 'Polling with setInterval', 'Fetch in useEffect']),
+        'severity': Level.HIGH,
+        'description': 'Multiple data fetching strategies detected',
+        'recommendation': 'Standardize on Server-Sent Events for reactive data'
+    },
+    'state_management': {
+        'patterns': frozenset(['React Query', 'useState', 'React Context', 'Zustand']),
+        'severity': Level.MEDIUM,
+        'description': 'Multiple state management approaches detected',
+        'recommendation': 'Use React Query for server state, useState for local UI, Context for shared UI'
+    },
+    'performance': {
+        'patterns': frozenset(['Next.js Image Component', 'Regular img tag']),
+        'severity': Level.MEDIUM,
+        'description': 'Inconsistent image handling detected',
+        'recommendation': 'Standardize on Next.js Image component for all images'
+    }
+}
+
+
+def find_needles(content: bytes) -> Tuple[set, set]:
+    """
+    Find which exclude literals and prefilter literals occur in content
+
+    Args:
+        content: Raw file bytes (bytes or an mmap)
+
+    Returns:
+        (excluded groups, groups with at least one needle present)
+    """
+    excluded = set()
+    present = set()
+
+    # One automaton walk covers every literal. mmapped files stay on the
+    # per-needle search - decoding them would copy the whole file.
+    if NEEDLE_AUTOMATON is not None and isinstance(content, bytes):
+        for _, payload in NEEDLE_AUTOMATON.iter(content.decode('latin-1')):
+            for kind, group in payload:
+                (excluded if kind == 'exclude' else present).add(group)
+        return excluded, present
+
+    excluded = {group for group, needle in PATTERN_EXCLUDES.items() if content.find(needle) != -1}
+    present = {
+        group for group, needles in PATTERN_NEEDLES.items()
+        if needles is not None and any(content.find(needle) != -1 for needle in needles)
+    }
+    return excluded, present
+
+
+def scan_content(content: bytes) -> Dict[str, List[int]]:
+    """
+    Find which patterns occur in a file's content
+
+    Args:
+        content: Raw file bytes (bytes or an mmap)
+
+    Returns:
+        {group: line_numbers} for every pattern that matched, with the first
+        5 matching line numbers
+    """
+    hits: Dict[str, List[int]] = {}
+
+    # Offsets of every newline, shared by all patterns: a match's line number
+    # is 1 + the number of newlines before it. Built on the first match only -
+    # files without any hits never pay for it.
+    newlines: Optional[List[int]] = None
+
+    # Vetoed patterns aren't scanned at all
+    excluded, present = find_needles(content)
+
+    for group, regex in PATTERN_REGEXES.items():
+        if group in excluded:
+            continue
+
+        # Literal search is far cheaper than starting the regex engine, and
+        # most files contain none of a given pattern's literals
+        if PATTERN_NEEDLES[group] is not None and group not in present:
+            continue
+
+        line_numbers: List[int] = []
+        for m in regex.finditer(content):
+            if newlines is None:
+                newlines = [nl.start() for nl in NEWLINE_RE.finditer(content)]
+            line_no = bisect_right(newlines, m.start()) + 1
+            if not line_numbers or line_numbers[-1] != line_no:
+                line_numbers.append(line_no)
+                if len(line_numbers) == 5:
+                    break
+        if line_numbers:
+            hits[group] = line_numbers
+
+    return hits
+
+
+def scan_file(path: str) -> Tuple[Dict[str, List[int]], Optional[str]]:
+    """
+    Read one source file and scan it (module-level so worker processes can run it)
+
+    The bytes are scanned as-is - no UTF-8 decode and no str copy. Large files
+    are memory-mapped so they're paged in as the regexes walk them.
+
+    Returns:
+        (hits, error) - hits as from scan_content(), error set if the file
+        couldn't be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_MIN_BYTES:
+                return scan_content(f.read()), None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return scan_content(mm), None
+    except Exception as e:
+        return {}, str(e)
+
+
+# tsconfig.json is JSONC: // and /* */ comments and trailing commas. Strings
+# are matched first so comment markers inside them (URLs) are left alone.
+JSONC_TOKEN_RE = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.DOTALL)
+JSONC_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+TSCONFIG_STRICT_RE = re.compile(r'"strict"\s*:\s*true\b')
+
+
+def strip_jsonc(text: str) -> str:
+    """Turn JSONC (tsconfig.json) into plain JSON"""
+    text = JSONC_TOKEN_RE.sub(lambda m: m.group(1) or '', text)
+    return JSONC_TRAILING_COMMA_RE.sub(r'\1', text)
+
+
+@lru_cache(maxsize=None)
+def category_title(category: str) -> str:
+    """'data_fetching' -> 'Data Fetching'"""
+    return category.replace('_', ' ').title()
+
+
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 200
+
+# Per-file scan results persist across runs, keyed by (mtime, size), so a
+# re-scan only reads files that changed. One cache file per scanned root.
+CACHE_DIR = Path.home() / ".cache" / "sentra"
+
+# Bump by hand whenever scan_content()/scan_file() change what a file's hits
+# look like (line numbering, match caps) - the pattern hash can't see that
+CACHE_FORMAT = 1
+
+# Changes whenever the patterns or CACHE_FORMAT do, invalidating every cached result
+PATTERNS_VERSION = hashlib.sha1(
+    repr([CACHE_FORMAT] + [(p[0], p[4], p[6]) for p in PATTERNS] + sorted(PATTERN_EXCLUDES.items())).encode()
+).hexdigest()[:8]
+
+
 class ArchitectureScanner:
     """Scans codebase for architectural patterns and conflicts"""
 
-    def __init__(self, root_path: str):
+    def __init__(self, root_path: str, jobs: Optional[int] = None, use_cache: bool = True):
         self.root_path = Path(root_path).resolve()
+        self.jobs = jobs or os.cpu_count() or 1  # worker processes for the file scan
+        self.cache_path: Optional[Path] = None
+        if use_cache:
+            root_hash = hashlib.sha1(str(self.root_path).encode()).hexdigest()[:12]
+            self.cache_path = CACHE_DIR / f"arch-scan-{root_hash}.json"
         self.exclude_dirs = {
             'node_modules', '.next', 'dist', 'build', '.git',
             '__pycache__', '.pytest_cache', 'coverage',
@@ -84,23 +443,45 @@ class ArchitectureScanner:
             summary=summary
         )
 
-    def get_source_files(self) -> List[Path]:
+    def get_source_files(self) -> List[str]:
         """Get all source files to scan"""
-        files = []
-        for file_path in self.root_path.rglob('*'):
-            # Skip excluded directories
-            if any(exc in file_path.parts for exc in self.exclude_dirs):
-                continue
-
-            # Only include source files
-            if file_path.is_file() and file_path.suffix in self.source_extensions:
-                files.append(file_path)
+        files = list(self._walk(str(self.root_path)))
 
         print(f"📁 Found {len(files)} source files to analyze")
         return files
 
+    def _walk(self, root: str) -> Iterator[str]:
+        """
+        Yield source file paths under root, never entering excluded directories
+
+        Files in a directory come before its subdirectories, the same order
+        Path.rglob() used. DirEntry type checks reuse the data from the
+        directory listing instead of a stat() per path.
+        """
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            return
+
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in self.exclude_dirs:
+                    subdirs.append(entry.path)
+            elif entry.is_file() and os.path.splitext(entry.name)[1] in self.source_extensions:
+                yield entry.path
+
+        for subdir in subdirs:
+            yield from self._walk(subdir)
+
     def detect_patterns(self) -> Dict[str, List[PatternUsage]]:
-        """Detect all patterns in codebase"""
+        """
+        Detect all patterns in codebase
+
+        Each file is read once and scanned with scan_file(), spread across
+        worker processes for larger trees. Files unchanged since the last run
+        reuse their cached results.
+        """
         found = {
             'data_fetching': [],
             'state_management': [],
@@ -115,432 +496,158 @@ class ArchitectureScanner:
 
         files = self.get_source_files()
 
-        # Data fetching patterns
-        print("🔎 Detecting data fetching patterns...")
-        found['data_fetching'].extend(self.detect_data_fetching_patterns(files))
-
-        # State management patterns
-        print("🔎 Detecting state management patterns...")
-        found['state_management'].extend(self.detect_state_patterns(files))
+        # One bucket per pattern so the report keeps its pattern-by-pattern order
+        buckets: Dict[str, List[PatternUsage]] = {group: [] for group in PATTERN_INFO}
 
-        # API design patterns
-        print("🔎 Detecting API design patterns...")
-        found['api_design'].extend(self.detect_api_patterns(files))
+        print("🔎 Detecting patterns...")
+        cache = self.load_cache()
+        new_cache: Dict[str, list] = {}
+        results: List[Optional[Tuple[Dict[str, List[int]], Optional[str]]]] = [None] * len(files)
+        stale: List[int] = []  # indexes of files that need scanning
 
-        # Component architecture patterns
-        print("🔎 Detecting component patterns...")
-        found['component_architecture'].extend(self.detect_component_patterns(files))
-
-        # Code quality patterns
-        print("🔎 Detecting code quality patterns...")
-        found['code_quality'].extend(self.detect_code_quality_patterns(files))
-
-        # Security patterns
-        print("🔎 Detecting security patterns...")
-        found['security'].extend(self.detect_security_patterns(files))
+        for i, file_path in enumerate(files):
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                stale.append(i)
+                continue
+            entry = cache.get(file_path)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                results[i] = (entry[2], None)
+                new_cache[file_path] = entry
+            else:
+                new_cache[file_path] = [st.st_mtime_ns, st.st_size, None]
+                stale.append(i)
+
+        if cache:
+            print(f"♻️ {len(files) - len(stale)} unchanged files reused from cache")
+
+        stale_paths = [files[i] for i in stale]
+        if self.jobs > 1 and len(stale_paths) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                scanned = list(executor.map(scan_file, stale_paths, chunksize=32))
+        else:
+            scanned = [scan_file(path) for path in stale_paths]
+
+        for i, (hits, error) in zip(stale, scanned):
+            results[i] = (hits, error)
+            entry = new_cache.get(files[i])
+            if entry is not None:
+                if error is None:
+                    entry[2] = hits
+                else:
+                    del new_cache[files[i]]  # retry unreadable files next run
+
+        if stale or len(new_cache) != len(cache):
+            self.save_cache(new_cache)
+
+        for file_path, (hits, error) in zip(files, results):
+            if error is not None:
+                print(f"⚠️ Warning: Could not read {file_path}: {error}")
+                continue
+            if not hits:
+                continue
 
-        # Performance patterns
-        print("🔎 Detecting performance patterns...")
-        found['performance'].extend(self.detect_performance_patterns(files))
+            relative_path = os.path.relpath(file_path, self.root_path)
+            for group, line_numbers in hits.items():
+                pattern_id, pattern_name, category, confidence = PATTERN_INFO[group]
+                buckets[group].append(PatternUsage(
+                    pattern_id=pattern_id,
+                    pattern_name=pattern_name,
+                    category=category,
+                    file_path=relative_path,
+                    line_numbers=line_numbers,
+                    confidence=confidence
+                ))
 
-        # Testing patterns
-        print("🔎 Detecting testing patterns...")
-        found['testing'].extend(self.detect_testing_patterns(files))
+        found['code_quality'].extend(self.detect_typescript_strict())
+        for group, (_, _, category, _) in PATTERN_INFO.items():
+            found[category].extend(buckets[group])
 
         return found
 
-    def detect_data_fetching_patterns(self, files: List[Path]) -> List[PatternUsage]:
-        """Detect data fetching patterns"""
-        patterns = []
-
-        # SSE Pattern
-        sse_pattern = re.compile(r'(EventSource|text/event-stream|ReadableStream)', re.IGNORECASE)
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-sse-reactive-data',
-                'Server-Sent Events',
-                'data_fetching',
-                sse_pattern
-            )
-        )
-
-        # Tauri Events Pattern
-        tauri_pattern = re.compile(r'(listen<|emit|emit_all|@tauri-apps/api/event)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-tauri-events-reactive',
-                'Tauri Events',
-                'data_fetching',
-                tauri_pattern
-            )
-        )
-
-        # React Server Components Pattern
-        rsc_pattern = re.compile(r'(export\s+default\s+async\s+function\s+\w+Page|await\s+fetch\(|await\s+db\.)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-rsc-data-fetching',
-                'React Server Components',
-                'data_fetching',
-                rsc_pattern,
-                exclude_pattern=re.compile(r"'use client'")  # Exclude client components
-            )
-        )
-
-        # Fetch in useEffect (anti-pattern to detect)
-        fetch_effect_pattern = re.compile(r'useEffect.*fetch\(')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-fetch-in-useeffect',
-                'Fetch in useEffect (Anti-pattern)',
-                'data_fetching',
-                fetch_effect_pattern,
-                confidence='MEDIUM'
-            )
-        )
-
-        # Polling (potential anti-pattern)
-        polling_pattern = re.compile(r'setInterval.*(?:fetch|axios)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-polling',
-                'Polling with setInterval',
-                'data_fetching',
-                polling_pattern,
-                confidence='MEDIUM'
-            )
-        )
-
-        return patterns
-
-    def detect_state_patterns(self, files: List[Path]) -> List[PatternUsage]:
-        """Detect state management patterns"""
+    def load_cache(self) -> Dict[str, list]:
+        """Load {path: [mtime_ns, size, hits]} from the last run (empty if stale or missing)"""
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != PATTERNS_VERSION:
+            return {}
+        return data.get('files', {})
+
+    def save_cache(self, files: Dict[str, list]) -> None:
+        """Persist per-file scan results for the next run (best effort)"""
+        if self.cache_path is None:
+            return
+        data = {'version': PATTERNS_VERSION, 'files': files}
+        tmp_path = None
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # A unique temp file per run, so concurrent scans of the same root
+            # can't interleave writes - the last os.replace() wins whole
+            with tempfile.NamedTemporaryFile(
+                dir=self.cache_path.parent, prefix=self.cache_path.stem + '-', suffix='.tmp', delete=False
+            ) as f:
+                tmp_path = f.name
+                f.write(orjson.dumps(data) if orjson is not None else json.dumps(data).encode())
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            print(f"⚠️ Warning: Could not write scan cache: {e}")
+
+    def detect_typescript_strict(self) -> List[PatternUsage]:
+        """Check tsconfig.json for strict mode"""
         patterns = []
 
-        # React Query
-        react_query_pattern = re.compile(r'(useQuery|useMutation|QueryClientProvider|@tanstack/react-query)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-react-query-state',
-                'React Query',
-                'state_management',
-                react_query_pattern
-            )
-        )
-
-        # useState
-        usestate_pattern = re.compile(r'useState<[^>]*>\(|useState\(')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-usestate-local-ui',
-                'useState',
-                'state_management',
-                usestate_pattern
-            )
-        )
-
-        # Context API
-        context_pattern = re.compile(r'(createContext|useContext|\.Provider)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-context-shared-ui',
-                'React Context',
-                'state_management',
-                context_pattern
-            )
-        )
-
-        # Zustand (if used)
-        zustand_pattern = re.compile(r'(create\(.*\)|useStore)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-zustand-state',
-                'Zustand',
-                'state_management',
-                zustand_pattern
-            )
-        )
-
-        return patterns
-
-    def detect_api_patterns(self, files: List[Path]) -> List[PatternUsage]:
-        """Detect API design patterns"""
-        patterns = []
-
-        # Zod validation
-        zod_pattern = re.compile(r'(z\.object|z\.string|z\.number|\.parse\(|\.safeParse\(|from [\'"]zod[\'"])')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-zod-validation',
-                'Zod Validation',
-                'api_design',
-                zod_pattern
-            )
-        )
-
-        # REST API routes
-        rest_pattern = re.compile(r'export\s+async\s+function\s+(GET|POST|PATCH|PUT|DELETE)\s*\(')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-rest-api-standard',
-                'REST API',
-                'api_design',
-                rest_pattern
-            )
-        )
-
-        return patterns
-
-    def detect_component_patterns(self, files: List[Path]) -> List[PatternUsage]:
-        """Detect component architecture patterns"""
-        patterns = []
-
-        # Client components
-        client_pattern = re.compile(r"'use client'")
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-client-component-boundaries',
-                'Client Components',
-                'component_architecture',
-                client_pattern
-            )
-        )
-
-        return patterns
-
-    def detect_code_quality_patterns(self, files: List[Path]) -> List[PatternUsage]:
-        """Detect code quality patterns"""
-        patterns = []
-
-        # Check tsconfig.json for strict mode
         tsconfig_path = self.root_path / 'tsconfig.json'
         if tsconfig_path.exists():
             try:
-                with open(tsconfig_path, 'r') as f:
+                with open(tsconfig_path, 'r', encoding='utf-8') as f:
                     content = f.read()
-                    if '"strict": true' in content:
-                        patterns.append(PatternUsage(
-                            pattern_id='pattern-typescript-strict',
-                            pattern_name='TypeScript Strict Mode',
-                            category='code_quality',
-                            file_path=str(tsconfig_path.relative_to(self.root_path)),
-                            line_numbers=[],
-                            confidence='HIGH'
-                        ))
             except Exception as e:
                 print(f"⚠️ Warning: Could not read tsconfig.json: {e}")
+                return patterns
 
-        # Detect any types (anti-pattern)
-        any_pattern = re.compile(r':\s*any\b')
-        any_usages = self.search_pattern(
-            files,
-            'pattern-any-type',
-            'TypeScript any (Anti-pattern)',
-            'code_quality',
-            any_pattern,
-            confidence='MEDIUM'
-        )
-        patterns.extend(any_usages)
-
-        # Detect ts-ignore (anti-pattern)
-        ignore_pattern = re.compile(r'@ts-ignore|@ts-expect-error')
-        ignore_usages = self.search_pattern(
-            files,
-            'pattern-ts-ignore',
-            'TypeScript @ts-ignore (Anti-pattern)',
-            'code_quality',
-            ignore_pattern,
-            confidence='MEDIUM'
-        )
-        patterns.extend(ignore_usages)
-
-        return patterns
-
-    def detect_security_patterns(self, files: List[Path]) -> List[PatternUsage]:
-        """Detect security patterns"""
-        patterns = []
-
-        # Environment validation
-        env_validation_pattern = re.compile(r'(envSchema|z\.object.*API_KEY|validateEnv)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-env-validation',
-                'Environment Variable Validation',
-                'security',
-                env_validation_pattern
-            )
-        )
-
-        # Detect raw SQL (potential SQL injection risk)
-        raw_sql_pattern = re.compile(r'(\$queryRaw|\$executeRaw|\$queryRawUnsafe)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-raw-sql',
-                'Raw SQL Queries (Review for SQL Injection)',
-                'security',
-                raw_sql_pattern,
-                confidence='MEDIUM'
-            )
-        )
-
-        # Detect dangerouslySetInnerHTML (XSS risk)
-        dangerous_html_pattern = re.compile(r'dangerouslySetInnerHTML')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-dangerous-html',
-                'dangerouslySetInnerHTML (XSS Risk)',
-                'security',
-                dangerous_html_pattern,
-                confidence='MEDIUM'
-            )
-        )
-
-        return patterns
-
-    def detect_performance_patterns(self, files: List[Path]) -> List[PatternUsage]:
-        """Detect performance patterns"""
-        patterns = []
-
-        # Next.js Image component
-        image_pattern = re.compile(r"from ['\"]next/image['\"]|<Image")
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-nextjs-image-optimization',
-                'Next.js Image Component',
-                'performance',
-                image_pattern
-            )
-        )
-
-        # Regular img tags (anti-pattern)
-        img_pattern = re.compile(r'<img\s+')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-img-tag',
-                'Regular img tag (Anti-pattern)',
-                'performance',
-                img_pattern,
-                confidence='MEDIUM'
-            )
-        )
-
-        return patterns
-
-    def detect_testing_patterns(self, files: List[Path]) -> List[PatternUsage]:
-        """Detect testing patterns"""
-        patterns = []
-
-        # AAA test structure
-        aaa_pattern = re.compile(r'(// ARRANGE|// ACT|// ASSERT)')
-        patterns.extend(
-            self.search_pattern(
-                files,
-                'pattern-aaa-test-structure',
-                'AAA Test Structure',
-                'testing',
-                aaa_pattern
-            )
-        )
-
-        return patterns
-
-    def search_pattern(
-        self,
-        files: List[Path],
-        pattern_id: str,
-        pattern_name: str,
-        category: str,
-        regex: re.Pattern,
-        confidence: str = 'HIGH',
-        exclude_pattern: Optional[re.Pattern] = None
-    ) -> List[PatternUsage]:
-        """Search for a specific pattern in all files"""
-        usages = []
-
-        for file_path in files:
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-
-                    # Skip if exclude pattern matches
-                    if exclude_pattern and exclude_pattern.search(content):
-                        continue
-
-                    matches = []
-                    for i, line in enumerate(content.split('\n'), start=1):
-                        if regex.search(line):
-                            matches.append(i)
-
-                    if matches:
-                        relative_path = file_path.relative_to(self.root_path)
-                        usages.append(PatternUsage(
-                            pattern_id=pattern_id,
-                            pattern_name=pattern_name,
-                            category=category,
-                            file_path=str(relative_path),
-                            line_numbers=matches[:5],  # Limit to first 5 matches
-                            confidence=confidence
-                        ))
-            except Exception as e:
-                print(f"⚠️ Warning: Could not read {file_path}: {e}")
+                config = json.loads(strip_jsonc(content))
+                strict = config.get('compilerOptions', {}).get('strict') is True
+            except (ValueError, AttributeError):
+                # Not parseable even as JSONC - fall back to a textual check
+                strict = TSCONFIG_STRICT_RE.search(content) is not None
+
+            if strict:
+                patterns.append(PatternUsage(
+                    pattern_id='pattern-typescript-strict',
+                    pattern_name='TypeScript Strict Mode',
+                    category='code_quality',
+                    file_path=str(tsconfig_path.relative_to(self.root_path)),
+                    line_numbers=[],
+                    confidence=Level.HIGH
+                ))
 
-        return usages
+        return patterns
 
     def find_conflicts(self, patterns_found: Dict) -> List[ArchitectureConflict]:
         """Identify conflicts where multiple patterns exist for the same problem"""
         conflicts = []
 
-        # Define which patterns in each category are mutually exclusive
-        conflict_groups = {
-            'data_fetching': {
-                'patterns': ['Server-Sent Events', 'Polling with setInterval', 'Fetch in useEffect'],
-                'severity': 'HIGH',
-                'description': 'Multiple data fetching strategies detected',
-                'recommendation': 'Standardize on Server-Sent Events for reactive data'
-            },
-            'state_management': {
-                'patterns': ['React Query', 'useState', 'React Context', 'Zustand'],
-                'severity': 'MEDIUM',
-                'description': 'Multiple state management approaches detected',
-                'recommendation': 'Use React Query for server state, useState for local UI, Context for shared UI'
-            },
-            'performance': {
-                'patterns': ['Next.js Image Component', 'Regular img tag'],
-                'severity': 'MEDIUM',
-                'description': 'Inconsistent image handling detected',
-                'recommendation': 'Standardize on Next.js Image component for all images'
-            }
-        }
-
         for category, usages in patterns_found.items():
-            if category not in conflict_groups:
+            if category not in CONFLICT_GROUPS:
                 continue
 
-            group = conflict_groups[category]
+            group = CONFLICT_GROUPS[category]
             pattern_counts = defaultdict(int)
-            affected_files = []
+            affected_files = set()
 
             for usage in usages:
                 if usage.pattern_name in group['patterns']:
                     pattern_counts[usage.pattern_name] += 1
-                    affected_files.append(usage.file_path)
+                    affected_files.add(usage.file_path)
 
             # Conflict exists if multiple patterns found
             if len(pattern_counts) > 1:
@@ -549,7 +656,7 @@ class ArchitectureScanner:
                     severity=group['severity'],
                     description=group['description'],
                     patterns_found=dict(pattern_counts),
-                    affected_files=list(set(affected_files)),
+                    affected_files=list(affected_files),
                     recommendation=group['recommendation']
                 ))
 
@@ -564,17 +671,19 @@ class ArchitectureScanner:
             if not usages:
                 continue
 
-            # Count unique patterns in category
-            pattern_names = set(u.pattern_name for u in usages)
+            # Files per pattern, gathered in a single pass over the usages
+            files_by_pattern: Dict[str, set] = defaultdict(set)
+            for usage in usages:
+                files_by_pattern[usage.pattern_name].add(usage.file_path)
 
             # If only 1 pattern used extensively (5+ files), it's consistent
-            if len(pattern_names) == 1:
-                pattern_name = list(pattern_names)[0]
-                file_count = len(set(u.file_path for u in usages))
+            if len(files_by_pattern) == 1:
+                pattern_name, files = next(iter(files_by_pattern.items()))
+                file_count = len(files)
 
                 if file_count >= 5:
                     consistent.append(
-                        f"{category.replace('_', ' ').title()}: {pattern_name} "
+                        f"{category_title(category)}: {pattern_name} "
                         f"(used consistently in {file_count} files)"
                     )
 
@@ -591,14 +700,15 @@ class ArchitectureScanner:
         # Recommendations for conflicts
         for conflict in conflicts:
             recommendations.append(
-                f"⚠️ {conflict.category.replace('_', ' ').title()}: {conflict.recommendation}"
+                f"⚠️ {category_title(conflict.category)}: {conflict.recommendation}"
             )
 
         # Recommendations for anti-patterns
         for category, usages in patterns_found.items():
+            counts = Counter(u.pattern_name for u in usages)
             for usage in usages:
                 if 'Anti-pattern' in usage.pattern_name:
-                    file_count = len([u for u in usages if u.pattern_name == usage.pattern_name])
+                    file_count = counts[usage.pattern_name]
                     recommendations.append(
                         f"❌ Remove {usage.pattern_name} (found in {file_count} files)"
                     )
@@ -609,14 +719,9 @@ class ArchitectureScanner:
             'pattern-typescript-strict': 'Enable TypeScript strict mode in tsconfig.json',
         }
 
+        present_ids = {u.pattern_id for usages in patterns_found.values() for u in usages}
         for pattern_id, rec in critical_patterns.items():
-            found = False
-            for usages in patterns_found.values():
-                if any(u.pattern_id == pattern_id for u in usages):
-                    found = True
-                    break
-
-            if not found:
+            if pattern_id not in present_ids:
                 recommendations.append(f"➕ {rec}")
 
         return recommendations
@@ -626,15 +731,16 @@ class ArchitectureScanner:
         patterns_found: Dict,
         conflicts: List[ArchitectureConflict]
     ) -> Dict:
-        """Generate summary statistics"""
-        total_patterns = sum(len(usages) for usages in patterns_found.values())
-        total_files = len(set(
-            usage.file_path
-            for usages in patterns_found.values()
-            for usage in usages
-        ))
-
-        categories_with_patterns = sum(1 for usages in patterns_found.values() if usages)
+        """Generate summary statistics (one pass over all usages)"""
+        total_patterns = 0
+        categories_with_patterns = 0
+        files = set()
+        for usages in patterns_found.values():
+            if usages:
+                categories_with_patterns += 1
+                total_patterns += len(usages)
+                files.update(usage.file_path for usage in usages)
+        total_files = len(files)
 
         return {
             'total_patterns_detected': total_patterns,
@@ -642,73 +748,62 @@ class ArchitectureScanner:
             'categories_with_patterns': categories_with_patterns,
             'total_categories': len(patterns_found),
             'conflicts_found': len(conflicts),
-            'high_severity_conflicts': sum(1 for c in conflicts if c.severity == 'HIGH'),
+            'high_severity_conflicts': sum(1 for c in conflicts if c.severity is Level.HIGH),
         }
 
 
 def generate_report_markdown(report: ArchitectureReport) -> str:
     """Generate markdown report"""
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
+    summary = report.summary
 
-    lines.append("# Architecture Analysis Report")
-    lines.append("")
-    lines.append(f"**Generated:** {__import__('datetime').datetime.now().isoformat()}")
-    lines.append("")
+    w("# Architecture Analysis Report\n\n")
+    w(f"**Generated:** {datetime.now().isoformat()}\n\n")
 
     # Summary
-    lines.append("## Summary")
-    lines.append("")
-    lines.append(f"- **Total Patterns Detected:** {report.summary['total_patterns_detected']}")
-    lines.append(f"- **Files Analyzed:** {report.summary['total_files_analyzed']}")
-    lines.append(f"- **Categories with Patterns:** {report.summary['categories_with_patterns']}/{report.summary['total_categories']}")
-    lines.append(f"- **Conflicts Found:** {report.summary['conflicts_found']}")
-    lines.append(f"- **High Severity Conflicts:** {report.summary['high_severity_conflicts']}")
-    lines.append("")
+    w("## Summary\n\n")
+    w(f"- **Total Patterns Detected:** {summary['total_patterns_detected']}\n")
+    w(f"- **Files Analyzed:** {summary['total_files_analyzed']}\n")
+    w(f"- **Categories with Patterns:** {summary['categories_with_patterns']}/{summary['total_categories']}\n")
+    w(f"- **Conflicts Found:** {summary['conflicts_found']}\n")
+    w(f"- **High Severity Conflicts:** {summary['high_severity_conflicts']}\n\n")
 
     # Conflicts
     if report.conflicts:
-        lines.append("## ⚠️ Conflicts Detected")
-        lines.append("")
+        w("## ⚠️ Conflicts Detected\n\n")
         for conflict in report.conflicts:
-            lines.append(f"### {conflict.category.replace('_', ' ').title()} ({conflict.severity} Priority)")
-            lines.append("")
-            lines.append(f"**Description:** {conflict.description}")
-            lines.append("")
-            lines.append("**Patterns Found:**")
+            w(f"### {category_title(conflict.category)} ({conflict.severity.name} Priority)\n\n")
+            w(f"**Description:** {conflict.description}\n\n")
+            w("**Patterns Found:**\n")
             for pattern, count in conflict.patterns_found.items():
-                lines.append(f"- {pattern}: {count} usages")
-            lines.append("")
-            lines.append(f"**Affected Files:** {len(conflict.affected_files)}")
-            lines.append("")
-            lines.append(f"**Recommendation:** {conflict.recommendation}")
-            lines.append("")
+                w(f"- {pattern}: {count} usages\n")
+            w("\n")
+            w(f"**Affected Files:** {len(conflict.affected_files)}\n\n")
+            w(f"**Recommendation:** {conflict.recommendation}\n\n")
 
     # Consistent Areas
     if report.consistent_areas:
-        lines.append("## ✅ Consistent Patterns")
-        lines.append("")
+        w("## ✅ Consistent Patterns\n\n")
         for area in report.consistent_areas:
-            lines.append(f"- {area}")
-        lines.append("")
+            w(f"- {area}\n")
+        w("\n")
 
     # Recommendations
     if report.recommendations:
-        lines.append("## 💡 Recommendations")
-        lines.append("")
+        w("## 💡 Recommendations\n\n")
         for rec in report.recommendations:
-            lines.append(f"- {rec}")
-        lines.append("")
+            w(f"- {rec}\n")
+        w("\n")
 
     # Pattern Details
-    lines.append("## 📊 Pattern Usage Details")
-    lines.append("")
+    w("## 📊 Pattern Usage Details\n\n")
 
     for category, usages in report.patterns_found.items():
         if not usages:
             continue
 
-        lines.append(f"### {category.replace('_', ' ').title()}")
-        lines.append("")
+        w(f"### {category_title(category)}\n\n")
 
         # Group by pattern name
         by_pattern = defaultdict(list)
@@ -717,21 +812,16 @@ def generate_report_markdown(report: ArchitectureReport) -> str:
 
         for pattern_name, pattern_usages in by_pattern.items():
             file_count = len(pattern_usages)
-            lines.append(f"**{pattern_name}** - {file_count} files")
-            lines.append("")
-            lines.append("<details>")
-            lines.append(f"<summary>Show files</summary>")
-            lines.append("")
+            w(f"**{pattern_name}** - {file_count} files\n\n")
+            w("<details>\n<summary>Show files</summary>\n\n")
             for usage in pattern_usages[:10]:  # Limit to first 10
                 line_info = f" (lines: {', '.join(map(str, usage.line_numbers))})" if usage.line_numbers else ""
-                lines.append(f"- `{usage.file_path}`{line_info}")
-            if len(pattern_usages) > 10:
-                lines.append(f"- ... and {len(pattern_usages) - 10} more files")
-            lines.append("")
-            lines.append("</details>")
-            lines.append("")
+                w(f"- `{usage.file_path}`{line_info}\n")
+            if file_count > 10:
+                w(f"- ... and {file_count - 10} more files\n")
+            w("\n</details>\n\n")
 
-    return '\n'.join(lines)
+    return buf.getvalue()
 
 
 def main():
@@ -742,22 +832,28 @@ def main():
     parser.add_argument('path', nargs='?', default='.', help='Path to codebase (default: current directory)')
     parser.add_argument('--format', choices=['json', 'markdown'], default='json', help='Output format')
     parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+    parser.add_argument('--jobs', '-j', type=int, help='Worker processes for scanning (default: CPU count, 1 to disable)')
+    parser.add_argument('--no-cache', action='store_true', help='Rescan every file, ignoring cached results')
 
     args = parser.parse_args()
 
     # Run scanner
-    scanner = ArchitectureScanner(args.path)
+    scanner = ArchitectureScanner(args.path, jobs=args.jobs, use_cache=not args.no_cache)
     report = scanner.scan_codebase()
 
     # Generate output
     if args.format == 'json':
-        output = json.dumps(asdict(report), indent=2)
+        data = asdict(report, dict_factory=level_names)
+        if orjson is not None:
+            output = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        else:
+            output = json.dumps(data, indent=2)
     else:
         output = generate_report_markdown(report)
 
     # Write output
     if args.output:
-        with open(args.output, 'w') as f:
+        with open(args.output, 'w', encoding='utf-8') as f:
             f.write(output)
         print(f"\n✅ Report written to: {args.output}")
     else:
@@ -12,9 +12,16 @@ Tests all 5 bug fixes:
 Created by Glen Barnhardt with help from Claude Code
 """
 
+import logging
+import math
+import threading
 import time
 import unittest
-from typing import List, Tuple
+from bisect import bisect_right
+from collections import deque
+from operator import itemgetter
+from unittest import mock
+from typing import Deque, Tuple
 
 
 # ============================================================================
@@ -24,6 +31,12 @@ from typing import List, Tuple
 class RateLimiter:
     """Track INPUT token usage per minute to stay within API limits"""
 
+    # No per-instance __dict__ - the attributes below are all it ever has
+    __slots__ = (
+        'tokens_per_minute', 'throttle_threshold', 'min_request_interval',
+        'tokens_used', 'last_request_time', '_lock', '_running_total', '_throttle_tokens',
+    )
+
     def __init__(self, tokens_per_minute: int = 20000, throttle_threshold: float = 0.8, min_request_interval: float = 2.5):
         """
         Initialize rate limiter
@@ -36,8 +49,16 @@ class RateLimiter:
         self.tokens_per_minute = tokens_per_minute
         self.throttle_threshold = throttle_threshold
         self.min_request_interval = min_request_interval
-        self.tokens_used: List[Tuple[float, int]] = []  # List of (timestamp, INPUT_token_count) tuples
+        # (timestamp, INPUT_token_count) per second that saw requests, oldest
+        # first - a second's requests share one entry stamped with the latest
+        # of them, so the window holds at most ~61 entries however busy it is
+        self.tokens_used: Deque[Tuple[float, int]] = deque()
         self.last_request_time: float = 0.0  # Track last request for pacing
+        self._lock = threading.Lock()  # Guards tokens_used and last_request_time
+        self._running_total = 0  # Sum of tokens in tokens_used, kept in step by add/prune
+        # Usage is a whole number of tokens, so usage >= threshold is the same
+        # test as usage >= ceil(threshold) - an int compare
+        self._throttle_tokens = math.ceil(tokens_per_minute * throttle_threshold)
 
     def add_usage(self, input_tokens: int, output_tokens: int) -> None:
         """
@@ -46,30 +67,92 @@ class RateLimiter:
         CRITICAL: Only input_tokens count against Anthropic's rate limit.
         Output tokens are tracked separately and don't affect rate limiting.
         """
-        now = time.time()
-        # BUG FIX #1: Only count INPUT tokens (output tokens don't count against limit)
-        self.tokens_used.append((now, input_tokens))
-
-        # Clean up old entries (older than 60 seconds)
+        with self._lock:
+            now = time.time()
+            # BUG FIX #1: Only count INPUT tokens (output tokens don't count against limit)
+            self._append(now, input_tokens)
+
+            # Clean up old entries (older than 60 seconds)
+            self._prune(now)
+
+            # Update last request time
+            self.last_request_time = now
+
+    # The helpers below take now from the caller so each public call reads the
+    # clock once (and again only after sleeping). Callers hold the lock.
+
+    def _append(self, now: float, input_tokens: int) -> None:
+        """Record input_tokens at now, folding into the newest entry if it's the same second"""
+        last = self.tokens_used[-1] if self.tokens_used else None
+        if last is not None and int(last[0]) == int(now):
+            self.tokens_used[-1] = (now, last[1] + input_tokens)
+        else:
+            self.tokens_used.append((now, input_tokens))
+        self._running_total += input_tokens
+
+    def _usage_at(self, now: float) -> int:
+        """INPUT tokens in the 60 seconds before now"""
+        self._prune(now)
+        return self._running_total
+
+    def _prune(self, now: float) -> None:
+        """Drop entries older than 60 seconds"""
         cutoff = now - 60
-        self.tokens_used = [(ts, tokens) for ts, tokens in self.tokens_used if ts > cutoff]
+        tokens_used = self.tokens_used
+        if not tokens_used or tokens_used[0][0] > cutoff:
+            return
+
+        # Entries are appended in timestamp order, so the expired ones are a
+        # prefix - binary search for its end instead of testing each entry
+        expired = bisect_right(tokens_used, cutoff, key=itemgetter(0))
+        if expired == len(tokens_used):
+            # Idle for a minute or more: drop everything in one go
+            tokens_used.clear()
+            self._running_total = 0
+        else:
+            for _ in range(expired):
+                self._running_total -= tokens_used.popleft()[1]
+
+    def try_consume(self, tokens: int) -> Tuple[bool, float]:
+        """
+        Atomically check the window and record usage if the request fits
 
-        # Update last request time
-        self.last_request_time = now
+        Pass INPUT tokens only, same as add_usage(). A request larger than the
+        threshold is still allowed into an empty window so it can't block forever.
+
+        Returns:
+            (ok, retry_after): ok is True if the tokens were recorded, otherwise
+            retry_after is how many seconds to wait before trying again
+        """
+        with self._lock:
+            now = time.time()
+
+            # Request pacing
+            time_since_last = now - self.last_request_time
+            if self.last_request_time > 0 and time_since_last < self.min_request_interval:
+                return False, self.min_request_interval - time_since_last
+
+            # Projected usage against threshold - pruning only lowers the
+            # total, so only prune when the unpruned total says we might be over
+            threshold = self._throttle_tokens
+            if self._running_total + tokens >= threshold:
+                self._prune(now)
+                if self.tokens_used and self._running_total + tokens >= threshold:
+                    oldest_time = self.tokens_used[0][0]
+                    return False, max(0.0, 60 - (now - oldest_time))
+
+            self._append(now, tokens)
+            self.last_request_time = now
+            return True, 0.0
 
     def get_current_usage(self) -> int:
         """Get total INPUT tokens used in the last 60 seconds"""
-        now = time.time()
-        cutoff = now - 60
-        # Clean up stale entries
-        self.tokens_used = [(ts, tokens) for ts, tokens in self.tokens_used if ts > cutoff]
-        return sum(tokens for _, tokens in self.tokens_used)
+        with self._lock:
+            return self._usage_at(time.time())
 
     def should_throttle(self) -> bool:
         """Check if we're approaching the rate limit"""
-        current = self.get_current_usage()
-        threshold = self.tokens_per_minute * self.throttle_threshold
-        return current >= threshold
+        return self.get_current_usage() >= self._throttle_tokens
 
     def estimate_next_request_tokens(self, conversation_turns: int) -> int:
         """
@@ -97,17 +180,21 @@ class RateLimiter:
             wait_for_pacing = self.min_request_interval - time_since_last
             logger_func(f"Request pacing: waiting {wait_for_pacing:.1f}s (min interval: {self.min_request_interval}s)")
             time.sleep(wait_for_pacing)
-
-        # 2. Check if next request would exceed threshold (proactive)
-        current_usage = self.get_current_usage()
+            now = time.time()
+
+        # 2. Check if next request would exceed threshold (proactive). The
+        # oldest timestamp is read under the same lock as the usage - another
+        # thread may prune the window as soon as it's released.
+        with self._lock:
+            current_usage = self._usage_at(now)
+            oldest_time = self.tokens_used[0][0] if self.tokens_used else None
         estimated_next = self.estimate_next_request_tokens(conversation_turns)
         projected_usage = current_usage + estimated_next
-        threshold = self.tokens_per_minute * self.throttle_threshold
+        threshold = self._throttle_tokens
 
         if projected_usage >= threshold:
             # Wait for oldest tokens to age out of 60-second window
-            if self.tokens_used:
-                oldest_time = self.tokens_used[0][0]
+            if oldest_time is not None:
                 wait_time = 60 - (now - oldest_time) + 2  # +2s buffer
                 if wait_time > 0:
                     logger_func(
@@ -116,13 +203,12 @@ class RateLimiter:
                         f"waiting {wait_time:.1f}s for window reset"
                     )
                     time.sleep(wait_time)
-                    # Clean up old entries after wait
                     now = time.time()
-                    cutoff = now - 60
-                    self.tokens_used = [(ts, tokens) for ts, tokens in self.tokens_used if ts > cutoff]
 
-        # 3. Double-check we're under threshold after waiting
-        current_usage = self.get_current_usage()
+        # 3. Double-check we're under threshold after waiting (this also
+        # cleans up entries that aged out during the wait)
+        with self._lock:
+            current_usage = self._usage_at(now)
         if current_usage >= threshold:
             # Emergency wait - clear the entire window
             logger_func(
@@ -130,24 +216,55 @@ class RateLimiter:
                 f"waiting 65s to fully reset window"
             )
             time.sleep(65)
-            self.tokens_used = []
+            with self._lock:
+                self.tokens_used.clear()
+                self._running_total = 0
 
 
 # ============================================================================
 # Test Suite
 # ============================================================================
 
+class FakeClock:
+    """Virtual time: time() reads it and sleep() advances it instantly"""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += max(0.0, seconds)
+
+
+def set_window(limiter: RateLimiter, entries) -> None:
+    """Replace the limiter's window with (timestamp, tokens) entries, oldest first"""
+    limiter.tokens_used = deque(entries)
+    limiter._running_total = sum(tokens for _, tokens in entries)
+
+
+# Limiter log lines go here. Nothing prints them by default; pytest shows
+# them for failing tests (captured log), and assertLogs can inspect them.
+logger = logging.getLogger("test_rate_limiter")
+logger.setLevel(logging.INFO)
+
+
 class TestRateLimiter(unittest.TestCase):
     """Test suite for RateLimiter class"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.logs = []
-
     def log(self, message: str):
         """Mock logger function"""
-        self.logs.append(message)
-        print(f"[TEST LOG] {message}")
+        logger.info(message)
+
+    def use_fake_clock(self) -> FakeClock:
+        """Patch time.time/time.sleep with a FakeClock for the rest of the test"""
+        clock = FakeClock()
+        for name, fake in (("time", clock.time), ("sleep", clock.sleep)):
+            patcher = mock.patch.object(time, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return clock
 
     # ========================================================================
     # Bug Fix #1: Only INPUT tokens counted
@@ -185,37 +302,88 @@ class TestRateLimiter(unittest.TestCase):
 
     def test_request_pacing_enforced(self):
         """Bug Fix #2: Verify minimum 2.5s interval between requests"""
+        clock = self.use_fake_clock()
         limiter = RateLimiter(tokens_per_minute=10000, min_request_interval=0.5)  # Use 0.5s for faster testing
 
         # Simulate first request
         limiter.add_usage(input_tokens=100, output_tokens=100)
 
         # Try to make immediate second request
-        start_time = time.time()
-        limiter.wait_if_needed(self.log, conversation_turns=1)
-        elapsed = time.time() - start_time
+        start_time = clock.time()
+        with self.assertLogs(logger, logging.INFO) as logs:
+            limiter.wait_if_needed(self.log, conversation_turns=1)
+        elapsed = clock.time() - start_time
 
-        # Should have waited ~0.5s (min_request_interval)
-        self.assertGreaterEqual(elapsed, 0.4, "Should enforce minimum request interval")
-        self.assertIn("Request pacing", " ".join(self.logs), "Should log pacing wait")
+        # Should have waited 0.5s (min_request_interval)
+        self.assertAlmostEqual(elapsed, 0.5, msg="Should enforce minimum request interval")
+        self.assertIn("Request pacing", " ".join(logs.output), "Should log pacing wait")
 
     def test_no_pacing_after_sufficient_wait(self):
         """Verify pacing not enforced if enough time has passed"""
+        clock = self.use_fake_clock()
         limiter = RateLimiter(tokens_per_minute=10000, min_request_interval=0.2)
 
         # First request
         limiter.add_usage(input_tokens=100, output_tokens=100)
 
         # Wait longer than min_request_interval
-        time.sleep(0.3)
+        clock.sleep(0.3)
 
         # Second request should not require additional wait
-        start_time = time.time()
+        start_time = clock.time()
         limiter.wait_if_needed(self.log, conversation_turns=1)
-        elapsed = time.time() - start_time
+        elapsed = clock.time() - start_time
+
+        self.assertEqual(elapsed, 0.0, "Should not wait if enough time passed")
+
+    # ========================================================================
+    # Atomic check-and-consume
+    # ========================================================================
+
+    def test_try_consume_records_when_under_threshold(self):
+        """Verify try_consume records usage when the request fits"""
+        limiter = RateLimiter(tokens_per_minute=1000, throttle_threshold=0.8, min_request_interval=0.0)
+
+        ok, retry_after = limiter.try_consume(500)
+
+        self.assertTrue(ok)
+        self.assertEqual(retry_after, 0.0)
+        self.assertEqual(limiter.get_current_usage(), 500)
+
+    def test_try_consume_rejects_without_recording(self):
+        """Verify a rejected try_consume leaves the window untouched"""
+        limiter = RateLimiter(tokens_per_minute=1000, throttle_threshold=0.8, min_request_interval=0.0)
+        limiter.add_usage(input_tokens=600, output_tokens=0)
 
-        # Should be nearly instant (< 0.1s)
-        self.assertLess(elapsed, 0.1, "Should not wait if enough time passed")
+        # 600 + 300 would cross the 800 token threshold
+        ok, retry_after = limiter.try_consume(300)
+
+        self.assertFalse(ok)
+        self.assertGreater(retry_after, 55)
+        self.assertEqual(limiter.get_current_usage(), 600, "Rejected request should not be recorded")
+
+    def test_try_consume_reclaims_expired_tokens(self):
+        """Verify try_consume re-sums the window once the cached total looks full"""
+        limiter = RateLimiter(tokens_per_minute=1000, throttle_threshold=0.8, min_request_interval=0.0)
+        limiter.add_usage(input_tokens=700, output_tokens=0)
+
+        # Age the recorded usage out of the 60-second window
+        set_window(limiter, [(time.time() - 61, 700)])
+
+        ok, _ = limiter.try_consume(300)
+
+        self.assertTrue(ok, "Expired tokens should not block the request")
+        self.assertEqual(limiter.get_current_usage(), 300)
+
+    def test_try_consume_enforces_pacing(self):
+        """Verify try_consume reports the remaining pacing interval"""
+        limiter = RateLimiter(tokens_per_minute=10000, min_request_interval=0.5)
+
+        self.assertTrue(limiter.try_consume(100)[0])
+        ok, retry_after = limiter.try_consume(100)
+
+        self.assertFalse(ok)
+        self.assertLessEqual(retry_after, 0.5)
 
     # ========================================================================
     # Bug Fix #4: Proactive throttling (estimates next request)
@@ -251,11 +419,10 @@ class TestRateLimiter(unittest.TestCase):
         """Verify token estimation grows linearly with conversation turns"""
         limiter = RateLimiter(tokens_per_minute=1000)
 
-        # Test various turn counts
-        self.assertEqual(limiter.estimate_next_request_tokens(0), 500, "Base estimate should be 500")
-        self.assertEqual(limiter.estimate_next_request_tokens(1), 800, "1 turn = 500 + 300")
-        self.assertEqual(limiter.estimate_next_request_tokens(10), 3500, "10 turns = 500 + 3000")
-        self.assertEqual(limiter.estimate_next_request_tokens(20), 6500, "20 turns = 500 + 6000")
+        # Base estimate of 500, plus 300 per turn
+        for turns, expected in [(0, 500), (1, 800), (10, 3500), (20, 6500)]:
+            with self.subTest(turns=turns):
+                self.assertEqual(limiter.estimate_next_request_tokens(turns), expected)
 
     # ========================================================================
     # Window cleanup tests
@@ -284,18 +451,19 @@ class TestRateLimiter(unittest.TestCase):
 
         now = time.time()
 
-        # Add tokens at different timestamps within window
-        limiter.tokens_used = [
-            (now - 10, 200),  # 10 seconds ago
-            (now - 30, 300),  # 30 seconds ago
+        # Add tokens at different timestamps within window (oldest first)
+        recent = [
             (now - 50, 400),  # 50 seconds ago
+            (now - 30, 300),  # 30 seconds ago
+            (now - 10, 200),  # 10 seconds ago
         ]
+        set_window(limiter, recent)
 
         # All should be counted (all within 60s)
         self.assertEqual(limiter.get_current_usage(), 900)
 
         # Add old token outside window
-        limiter.tokens_used.append((now - 70, 500))
+        set_window(limiter, [(now - 70, 500)] + recent)
 
         # Should still be 900 (old token excluded)
         self.assertEqual(limiter.get_current_usage(), 900)
@@ -304,38 +472,21 @@ class TestRateLimiter(unittest.TestCase):
     # Threshold tests
     # ========================================================================
 
-    def test_should_throttle_at_threshold(self):
-        """Verify should_throttle() returns True at threshold"""
-        limiter = RateLimiter(tokens_per_minute=1000, throttle_threshold=0.8)
-
-        # Add usage to exactly hit threshold (800 tokens)
-        limiter.add_usage(input_tokens=800, output_tokens=0)
-
-        self.assertTrue(limiter.should_throttle(), "Should throttle at threshold")
-
-    def test_should_not_throttle_below_threshold(self):
-        """Verify should_throttle() returns False below threshold"""
-        limiter = RateLimiter(tokens_per_minute=1000, throttle_threshold=0.8)
-
-        # Add usage below threshold (700 < 800)
-        limiter.add_usage(input_tokens=700, output_tokens=0)
-
-        self.assertFalse(limiter.should_throttle(), "Should not throttle below threshold")
-
-    def test_custom_threshold_values(self):
-        """Test different threshold values"""
-        # 50% threshold
-        limiter = RateLimiter(tokens_per_minute=1000, throttle_threshold=0.5)
-        limiter.add_usage(input_tokens=500, output_tokens=0)
-        self.assertTrue(limiter.should_throttle(), "Should throttle at 50% threshold")
-
-        # 90% threshold
-        limiter = RateLimiter(tokens_per_minute=1000, throttle_threshold=0.9)
-        limiter.add_usage(input_tokens=850, output_tokens=0)
-        self.assertFalse(limiter.should_throttle(), "Should not throttle below 90% threshold")
-
-        limiter.add_usage(input_tokens=50, output_tokens=0)  # Now at 900
-        self.assertTrue(limiter.should_throttle(), "Should throttle at 90% threshold")
+    def test_threshold_matrix(self):
+        """Verify should_throttle() flips exactly at each threshold"""
+        cases = [
+            # (tokens_per_minute, threshold, usage, should_throttle)
+            (1000, 0.5, 500, True),   # At 50% threshold
+            (1000, 0.8, 700, False),  # Below 80% threshold
+            (1000, 0.8, 800, True),   # Exactly at 80% threshold
+            (1000, 0.9, 850, False),  # Below 90% threshold
+            (1000, 0.9, 900, True),   # Exactly at 90% threshold
+        ]
+        for tpm, threshold, usage, expected in cases:
+            with self.subTest(threshold=threshold, usage=usage):
+                limiter = RateLimiter(tokens_per_minute=tpm, throttle_threshold=threshold)
+                limiter.add_usage(input_tokens=usage, output_tokens=0)
+                self.assertEqual(limiter.should_throttle(), expected)
 
     # ========================================================================
     # Edge cases
@@ -369,6 +520,23 @@ class TestRateLimiter(unittest.TestCase):
         self.assertEqual(limiter.get_current_usage(), 500)
         self.assertFalse(limiter.should_throttle(), "Burst below threshold should not throttle")
 
+    def test_same_second_requests_share_entry(self):
+        """Verify requests within one second fold into a single window entry"""
+        clock = self.use_fake_clock()
+        clock.now = 1_700_000_000.0
+        limiter = RateLimiter(tokens_per_minute=1000)
+
+        limiter.add_usage(input_tokens=100, output_tokens=0)
+        clock.sleep(0.4)
+        limiter.add_usage(input_tokens=200, output_tokens=0)
+        self.assertEqual(len(limiter.tokens_used), 1, "Same-second requests should share an entry")
+        self.assertEqual(limiter.tokens_used[0], (clock.now, 300), "Entry is stamped with the latest request")
+
+        clock.sleep(0.7)
+        limiter.add_usage(input_tokens=50, output_tokens=0)
+        self.assertEqual(len(limiter.tokens_used), 2, "A new second should start a new entry")
+        self.assertEqual(limiter.get_current_usage(), 350)
+
     def test_very_large_tokens(self):
         """Test handling very large token counts"""
         limiter = RateLimiter(tokens_per_minute=100000)  # 100k limit
@@ -384,12 +552,12 @@ class TestRateLimiter(unittest.TestCase):
         now = time.time()
 
         # Add tokens at various times
-        limiter.tokens_used = [
+        set_window(limiter, [
             (now - 100, 100),  # Should be removed
             (now - 70, 200),   # Should be removed
             (now - 50, 300),   # Should be kept
             (now - 30, 400),   # Should be kept
-        ]
+        ])
 
         # First cleanup via get_current_usage()
         usage = limiter.get_current_usage()
@@ -405,6 +573,7 @@ class TestRateLimiter(unittest.TestCase):
 
     def test_realistic_conversation_flow(self):
         """Test realistic conversation with multiple turns"""
+        clock = self.use_fake_clock()
         limiter = RateLimiter(tokens_per_minute=20000, throttle_threshold=0.8, min_request_interval=0.1)
 
         # Simulate 10 conversation turns
@@ -416,7 +585,7 @@ class TestRateLimiter(unittest.TestCase):
             )
 
             # Small delay between turns
-            time.sleep(0.05)
+            clock.sleep(0.05)
 
         # Check total input tokens (should be sum of growing inputs)
         # Turn 0: 500, Turn 1: 800, Turn 2: 1100, ..., Turn 9: 3200
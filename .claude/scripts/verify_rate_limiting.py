@@ -12,149 +12,233 @@ This script verifies all 5 bug fixes are present in the code:
 Created by Glen Barnhardt with help from Claude Code
 """
 
+import mmap
+import os
 import re
 import sys
 from pathlib import Path
-
-
-def verify_bug_fix_1(content: str) -> tuple[bool, str]:
+from typing import Set
+
+# pyahocorasick (optional) finds every needle in a single walk of the source
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# The worker is checked as raw bytes, so patterns and needles are bytes too.
+# Compiled once at import. A method body is everything up to the next
+# "\n    def " - (?:(?!...).)*? keeps the DOTALL search from running on into
+# the methods after it.
+_METHOD_BODY = rb'(?:(?!\n    def ).)*?'
+ADD_USAGE_RE = re.compile(
+    rb'def add_usage\(self, input_tokens: int, output_tokens: int\)' + _METHOD_BODY
+    + rb'self\._append\(now, input_tokens\)',
+    re.DOTALL,
+)
+APPEND_RE = re.compile(
+    rb'def _append\(self, now: float, input_tokens: int\)' + _METHOD_BODY
+    + rb'self\.tokens_used\.append\(\(now, input_tokens\)\)',
+    re.DOTALL,
+)
+BACKOFF_RE = re.compile(rb'wait_time = 60 \* \(2 \*\* attempt\)')
+
+
+# Each check's literal needles sit in a table just above it, and the check
+# tests them by key against the set find_needles() returns. NEEDLES is built
+# from these tables, so a needle can't be checked without being searched for.
+FIX_1_NEEDLES = {
+    "comment": b"BUG FIX #1: Only count INPUT tokens",
+    "docs": b"Only input_tokens count against Anthropic's rate limit",
+}
+
+
+def verify_bug_fix_1(content: bytes, found: Set[bytes]) -> tuple[bool, str]:
     """Verify Bug Fix #1: Only INPUT tokens counted"""
     # Check for comment mentioning fix
-    if "BUG FIX #1: Only count INPUT tokens" not in content:
+    if FIX_1_NEEDLES["comment"] not in found:
         return False, "Missing BUG FIX #1 comment"
 
     # Check that add_usage only uses input_tokens
-    pattern = r'def add_usage\(self, input_tokens: int, output_tokens: int\).*?self\.tokens_used\.append\(\(now, input_tokens\)\)'
-    if not re.search(pattern, content, re.DOTALL):
-        return False, "add_usage() doesn't append only input_tokens"
+    if not ADD_USAGE_RE.search(content):
+        return False, "add_usage() doesn't record only input_tokens"
+
+    # ...and that _append() stores what it's given
+    if not APPEND_RE.search(content):
+        return False, "_append() doesn't append (now, input_tokens)"
 
     # Verify comment about output tokens
-    if "Only input_tokens count against Anthropic's rate limit" not in content:
+    if FIX_1_NEEDLES["docs"] not in found:
         return False, "Missing documentation about input-only counting"
 
     return True, "✅ Only INPUT tokens are counted (output ignored)"
 
 
-def verify_bug_fix_2(content: str) -> tuple[bool, str]:
+FIX_2_NEEDLES = {
+    "comment": b"BUG FIX #2: Add minimum request pacing",
+    "param": b"min_request_interval: float = 2.5",
+    "enforce": b"time_since_last < self.min_request_interval",
+    "log": b'"Request pacing: waiting',
+}
+
+
+def verify_bug_fix_2(content: bytes, found: Set[bytes]) -> tuple[bool, str]:
     """Verify Bug Fix #2: Request pacing (2.5s minimum interval)"""
     # Check for comment mentioning fix
-    if "BUG FIX #2: Add minimum request pacing" not in content:
+    if FIX_2_NEEDLES["comment"] not in found:
         return False, "Missing BUG FIX #2 comment"
 
     # Check for min_request_interval parameter
-    if "min_request_interval: float = 2.5" not in content:
+    if FIX_2_NEEDLES["param"] not in found:
         return False, "Missing min_request_interval parameter (should be 2.5s)"
 
     # Check for pacing enforcement logic
-    if "time_since_last < self.min_request_interval" not in content:
+    if FIX_2_NEEDLES["enforce"] not in found:
         return False, "Missing pacing enforcement logic"
 
     # Check for "Request pacing: waiting" log message
-    if '"Request pacing: waiting' not in content:
+    if FIX_2_NEEDLES["log"] not in found:
         return False, "Missing request pacing log message"
 
     return True, "✅ Request pacing enforced (2.5s minimum interval)"
 
 
-def verify_bug_fix_3(content: str) -> tuple[bool, str]:
+FIX_3_NEEDLES = {
+    "comment": b"BUG FIX #3: Trim conversation history after 20 turns",
+    "trim": b"if len(self.messages) > 21:",
+    "keep_initial": b"initial_prompt = self.messages[0]",
+    "keep_recent": b"recent_messages = self.messages[-20:]",
+    "log": b'"Trimming conversation history',
+}
+
+
+def verify_bug_fix_3(content: bytes, found: Set[bytes]) -> tuple[bool, str]:
     """Verify Bug Fix #3: Conversation history trimming"""
     # Check for comment mentioning fix
-    if "BUG FIX #3: Trim conversation history after 20 turns" not in content:
+    if FIX_3_NEEDLES["comment"] not in found:
         return False, "Missing BUG FIX #3 comment"
 
     # Check for trimming logic
-    if "if len(self.messages) > 21:" not in content:
+    if FIX_3_NEEDLES["trim"] not in found:
         return False, "Missing conversation trimming logic (should trim at 21)"
 
     # Check that it keeps initial prompt
-    if "initial_prompt = self.messages[0]" not in content:
+    if FIX_3_NEEDLES["keep_initial"] not in found:
         return False, "Trimming doesn't preserve initial prompt"
 
     # Check that it keeps last 20 messages
-    if "recent_messages = self.messages[-20:]" not in content:
+    if FIX_3_NEEDLES["keep_recent"] not in found:
         return False, "Trimming doesn't keep last 20 messages"
 
     # Check for trimming log message
-    if '"Trimming conversation history' not in content:
+    if FIX_3_NEEDLES["log"] not in found:
         return False, "Missing conversation trimming log message"
 
     return True, "✅ Conversation history trimmed (keeps initial + last 20)"
 
 
-def verify_bug_fix_4(content: str) -> tuple[bool, str]:
+FIX_4_NEEDLES = {
+    "comment": b"BUG FIX #4: Proactive throttling BEFORE request",
+    "estimate": b"def estimate_next_request_tokens(self, conversation_turns: int)",
+    "project": b"projected_usage = current_usage + estimated_next",
+    "log": b'"Rate limit PROACTIVE throttle',
+    "formula": b"return 500 + (conversation_turns * 300)",
+}
+
+
+def verify_bug_fix_4(content: bytes, found: Set[bytes]) -> tuple[bool, str]:
     """Verify Bug Fix #4: Proactive throttling"""
     # Check for comment mentioning fix
-    if "BUG FIX #4: Proactive throttling BEFORE request" not in content:
+    if FIX_4_NEEDLES["comment"] not in found:
         return False, "Missing BUG FIX #4 comment"
 
     # Check for estimate_next_request_tokens method
-    if "def estimate_next_request_tokens(self, conversation_turns: int)" not in content:
+    if FIX_4_NEEDLES["estimate"] not in found:
         return False, "Missing estimate_next_request_tokens() method"
 
     # Check for proactive logic in wait_if_needed
-    if "projected_usage = current_usage + estimated_next" not in content:
+    if FIX_4_NEEDLES["project"] not in found:
         return False, "Missing proactive projection logic"
 
     # Check for proactive throttle log message
-    if '"Rate limit PROACTIVE throttle' not in content:
+    if FIX_4_NEEDLES["log"] not in found:
         return False, "Missing proactive throttle log message"
 
     # Verify estimation formula (500 + turns * 300)
-    if "return 500 + (conversation_turns * 300)" not in content:
+    if FIX_4_NEEDLES["formula"] not in found:
         return False, "Incorrect token estimation formula"
 
     return True, "✅ Proactive throttling (estimates next request)"
 
 
-def verify_bug_fix_5(content: str) -> tuple[bool, str]:
+FIX_5_NEEDLES = {
+    "comment": b"BUG FIX #5: Proper exponential backoff starting at 60s",
+    "formula": b"wait_time = 60 * (2 ** attempt)",
+    "handler": b"anthropic.RateLimitError",
+    "log": b'"Rate limit 429 error',
+}
+
+
+def verify_bug_fix_5(content: bytes, found: Set[bytes]) -> tuple[bool, str]:
     """Verify Bug Fix #5: Proper retry backoff"""
     # Check for comment mentioning fix
-    if "BUG FIX #5: Proper exponential backoff starting at 60s" not in content:
+    if FIX_5_NEEDLES["comment"] not in found:
         return False, "Missing BUG FIX #5 comment"
 
     # Check for exponential backoff formula
-    if "wait_time = 60 * (2 ** attempt)" not in content:
+    if FIX_5_NEEDLES["formula"] not in found:
         return False, "Missing exponential backoff formula (should be 60 * 2^attempt)"
 
     # Check that it starts at 60s (not smaller)
-    pattern = r'wait_time = 60 \* \(2 \*\* attempt\)'
-    if not re.search(pattern, content):
+    if not BACKOFF_RE.search(content):
         return False, "Backoff doesn't start at 60s"
 
     # Check for 429 error handling
-    if "anthropic.RateLimitError" not in content:
+    if FIX_5_NEEDLES["handler"] not in found:
         return False, "Missing RateLimitError handling"
 
     # Check for rate limit log message
-    if '"Rate limit 429 error' not in content:
+    if FIX_5_NEEDLES["log"] not in found:
         return False, "Missing rate limit error log message"
 
     return True, "✅ Proper retry backoff (60s, 120s, 240s)"
 
 
-def verify_configuration(content: str) -> tuple[bool, str]:
+CONFIG_NEEDLES = {
+    "tpm_env": b"CLAUDE_RATE_LIMIT_TPM",
+    "retries_env": b"CLAUDE_RATE_LIMIT_RETRIES",
+    "threshold_env": b"CLAUDE_RATE_LIMIT_THRESHOLD",
+    "tpm_env_default": b'"20000"',
+    "tpm_default": b"tokens_per_minute=20000",
+    "threshold_env_default": b'"0.8"',
+    "threshold_default": b"throttle_threshold=0.8",
+    "init": b"self.rate_limiter = RateLimiter(",
+}
+
+
+def verify_configuration(content: bytes, found: Set[bytes]) -> tuple[bool, str]:
     """Verify rate limiting configuration"""
     issues = []
 
     # Check for environment variables
-    if "CLAUDE_RATE_LIMIT_TPM" not in content:
+    if CONFIG_NEEDLES["tpm_env"] not in found:
         issues.append("Missing CLAUDE_RATE_LIMIT_TPM env var")
 
-    if "CLAUDE_RATE_LIMIT_RETRIES" not in content:
+    if CONFIG_NEEDLES["retries_env"] not in found:
         issues.append("Missing CLAUDE_RATE_LIMIT_RETRIES env var")
 
-    if "CLAUDE_RATE_LIMIT_THRESHOLD" not in content:
+    if CONFIG_NEEDLES["threshold_env"] not in found:
         issues.append("Missing CLAUDE_RATE_LIMIT_THRESHOLD env var")
 
     # Check default values (either in __init__ or from env var)
-    if '"20000"' not in content and 'tokens_per_minute=20000' not in content:
+    if CONFIG_NEEDLES["tpm_env_default"] not in found and CONFIG_NEEDLES["tpm_default"] not in found:
         issues.append("Default tokens_per_minute should be 20000")
 
-    if '"0.8"' not in content and 'throttle_threshold=0.8' not in content:
+    if CONFIG_NEEDLES["threshold_env_default"] not in found and CONFIG_NEEDLES["threshold_default"] not in found:
         issues.append("Default throttle_threshold should be 0.8")
 
     # Check that RateLimiter is initialized with config
-    if 'self.rate_limiter = RateLimiter(' not in content:
+    if CONFIG_NEEDLES["init"] not in found:
         issues.append("RateLimiter not initialized")
 
     if issues:
@@ -163,20 +247,27 @@ def verify_configuration(content: str) -> tuple[bool, str]:
     return True, "✅ Configuration properly set (20k TPM, 80% threshold, 3 retries)"
 
 
-def verify_usage_tracking(content: str) -> tuple[bool, str]:
+USAGE_NEEDLES = {
+    "add_usage": b"self.rate_limiter.add_usage(usage.input_tokens, usage.output_tokens)",
+    "wait": b"self.rate_limiter.wait_if_needed(self.log, conversation_turns=",
+    "turns": b"conversation_turns=turn",
+}
+
+
+def verify_usage_tracking(content: bytes, found: Set[bytes]) -> tuple[bool, str]:
     """Verify proper usage tracking"""
     issues = []
 
     # Check that rate_limiter.add_usage is called after API response
-    if "self.rate_limiter.add_usage(usage.input_tokens, usage.output_tokens)" not in content:
+    if USAGE_NEEDLES["add_usage"] not in found:
         issues.append("add_usage not called with input/output tokens")
 
     # Check that wait_if_needed is called BEFORE API call
-    if "self.rate_limiter.wait_if_needed(self.log, conversation_turns=" not in content:
+    if USAGE_NEEDLES["wait"] not in found:
         issues.append("wait_if_needed not called with conversation_turns")
 
     # Check that conversation_turns is passed to _call_claude_with_retry
-    if "conversation_turns=turn" not in content:
+    if USAGE_NEEDLES["turns"] not in found:
         issues.append("conversation_turns not passed to API call")
 
     if issues:
@@ -185,6 +276,66 @@ def verify_usage_tracking(content: str) -> tuple[bool, str]:
     return True, "✅ Usage tracking properly implemented"
 
 
+# Every literal the checks look for, gathered from their needle tables
+NEEDLES = tuple(
+    needle
+    for table in (
+        FIX_1_NEEDLES, FIX_2_NEEDLES, FIX_3_NEEDLES, FIX_4_NEEDLES, FIX_5_NEEDLES,
+        CONFIG_NEEDLES, USAGE_NEEDLES,
+    )
+    for needle in table.values()
+)
+
+
+def build_needle_automaton():
+    """Build an Aho-Corasick automaton over NEEDLES (None without pyahocorasick)"""
+    if ahocorasick is None:
+        return None
+
+    # pyahocorasick's default build only takes str keys, so needles are added
+    # as latin-1 - source bytes decoded the same way keep 1:1 offsets
+    automaton = ahocorasick.Automaton()
+    for needle in NEEDLES:
+        automaton.add_word(needle.decode('latin-1'), needle)
+    automaton.make_automaton()
+    return automaton
+
+
+NEEDLE_AUTOMATON = build_needle_automaton()
+
+# Files at least this big are memory-mapped instead of read into memory
+MMAP_MIN_BYTES = 1024 * 1024
+
+
+def find_needles(content: bytes) -> Set[bytes]:
+    """Return the NEEDLES present in content (bytes or an mmap)"""
+    # One automaton walk covers every needle. An mmapped file stays on the
+    # per-needle search - decoding it would copy the whole file.
+    if NEEDLE_AUTOMATON is not None and isinstance(content, bytes):
+        return {needle for _, needle in NEEDLE_AUTOMATON.iter(content.decode('latin-1'))}
+    return {needle for needle in NEEDLES if content.find(needle) != -1}
+
+
+def run_checks(content: bytes, checks) -> list:
+    """Run every check against content, returning [(name, passed, message)]"""
+    found = find_needles(content)
+    return [(name, *check_func(content, found)) for name, check_func in checks]
+
+
+def check_file(path: Path, checks) -> list:
+    """
+    Run the checks against a file's raw bytes
+
+    Small files are read whole; large ones are memory-mapped so they're paged
+    in as the searches walk them.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            return run_checks(f.read(), checks)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return run_checks(mm, checks)
+
+
 def main():
     """Run all verification checks"""
     print("="*80)
@@ -199,8 +350,6 @@ def main():
         print(f"❌ ERROR: Script not found at {script_path}")
         return 1
 
-    content = script_path.read_text()
-
     # Run all checks
     checks = [
         ("Bug Fix #1: Only INPUT tokens counted", verify_bug_fix_1),
@@ -213,12 +362,9 @@ def main():
     ]
 
     all_passed = True
-    results = []
-
-    for name, check_func in checks:
-        passed, message = check_func(content)
-        results.append((name, passed, message))
+    results = check_file(script_path, checks)
 
+    for name, passed, message in results:
         if passed:
             print(f"✅ {name}")
             print(f"   {message}")